@@ -5,7 +5,7 @@ Created by Singh Industries - Engineered by Mr. Prabhnoor Singh
 ✅ All Original Features Preserved | ✅ Speech/TTS System Fixed
 """
 
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 import os
 import sys
 import time
@@ -16,21 +16,31 @@ import subprocess
 import webbrowser
 import re
 import json
+import hashlib
 import logging
 import random
 import shutil
+import socket
+import sqlite3
 import psutil
 import pyautogui
 import pyperclip
 from datetime import datetime, timedelta
 from pathlib import Path
+from urllib.parse import urlparse
 from typing import Optional, Dict, List, Any, Tuple
 from dataclasses import dataclass, asdict, field
 from enum import Enum
 from functools import lru_cache, wraps
-from collections import deque
+from collections import deque, OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 import queue
-import tempfile
+import io
+import wave
+import ctypes
+import ctypes.util
 
 # ============================================================================
 # OPTIONAL IMPORTS WITH FALLBACKS
@@ -137,6 +147,24 @@ def safe_execution(func):
             return f"Operation failed: {str(e)}"
     return wrapper
 
+# ============================================================================
+# TEXT NORMALIZATION
+# ============================================================================
+def hotword_pattern(hotword: str) -> "re.Pattern":
+    """Matches a leading ('hey jarvis ...') or trailing ('... jarvis') hotword; group 1 is the greeting"""
+    hotword = re.escape(hotword.lower())
+    return re.compile(rf'^(?:(hey|hi|ok|okay)\s+)?{hotword}\b\s*|\s*\b{hotword}$')
+
+def normalize_utterance(text: str, hotword_re: "re.Pattern") -> str:
+    """Lowercase, drop punctuation, collapse whitespace and strip the hotword.
+    A bare greeting ('hey jarvis') keeps the greeting; a bare hotword is returned as is."""
+    cleaned = re.sub(r"[^\w\s']", ' ', text.lower())
+    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    stripped = hotword_re.sub('', cleaned).strip()
+    if not stripped:
+        stripped = hotword_re.sub(lambda m: m.group(1) or '', cleaned).strip()
+    return stripped or cleaned
+
 # ============================================================================
 # ENUMS
 # ============================================================================
@@ -147,6 +175,7 @@ class OSType(Enum):
 
 class SystemState(Enum):
     IDLE = "idle"
+    HOTWORD = "hotword"
     LISTENING = "listening"
     SPEAKING = "speaking"
     PROCESSING = "processing"
@@ -178,9 +207,27 @@ class MediaType(Enum):
     PODCAST = "podcast"
     AUDIOBOOK = "audiobook"
 
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class SpeechPriority(Enum):
+    ALERT = 0
+    RESPONSE = 1
+    CHATTER = 2
+
 # ============================================================================
 # DATACLASSES
 # ============================================================================
+@dataclass
+class PcmAudio:
+    """Decoded audio ready for the sound device"""
+    frames: bytes
+    channels: int
+    sample_width: int
+    rate: int
+
 @dataclass
 class OSInfo:
     system: str
@@ -227,6 +274,7 @@ class ConfigManager:
         self.config_file = Path(config_file)
         self._cache = {}
         self._lock = threading.RLock()
+        self.version = 0  # bumped on every set() so dependants can rebuild derived state
         self.config = self._load_config()
     
     def _load_config(self) -> Dict[str, Any]:
@@ -283,6 +331,51 @@ class ConfigManager:
             "music_volume": 70,
             "human_like_voice": True,
             "music_cache_dir": str(Path.home() / ".jarvis_music_cache"),
+            "data_storage_mode": "json",
+            "journal_compact_bytes": 262144,
+            "autosave_interval": 5,
+            "ai_streaming": True,
+            "response_cache_max_entries": 256,
+            "response_cache_max_bytes": 262144,
+            "response_cache_ttl": 86400,
+            "ai_prompt_caching": True,
+            "context_token_budget": 1200,
+            "context_summary_tokens": 200,
+            "breaker_failure_threshold": 3,
+            "breaker_window": 60,
+            "breaker_reset_timeout": 15,
+            "breaker_max_reset_timeout": 300,
+            "youtube_timeout": 10,
+            "youtube_search_ttl": 86400,
+            "youtube_stream_ttl": 3600,
+            "youtube_cache_entries": 256,
+            "music_prefetch_tracks": 2,
+            "music_prefetch_buffer": False,
+            "music_cache_max_bytes": 1073741824,
+            "music_cache_min_plays": 2,
+            "music_cache_flush_interval": 2,
+            "playback_position_interval": 1.0,
+            "tts_cache_enabled": True,
+            "tts_cache_dir": str(Path.home() / ".jarvis_tts_cache"),
+            "tts_cache_max_bytes": 67108864,
+            "tts_cache_memory_bytes": 8388608,
+            "tts_prerender": True,
+            "tts_prerender_delay": 5,
+            "tts_espeak_library": True,
+            "http_pool_hosts": 10,
+            "http_pool_size": 8,
+            "dns_cache_ttl": 300,
+            "http_warmup_urls": [],
+            "default_city": "",
+            "geolocation_ttl": 86400,
+            "weather_cache_ttl": 600,
+            "weather_stale_ttl": 21600,
+            "weather_refresh_interval": 300,
+            "ai_routes": {
+                "chat": {"max_tokens": 120, "timeout": 6},
+                "factual": {"max_tokens": 300, "timeout": 8},
+                "code": {"max_tokens": 1500, "timeout": 30},
+            },
         }
         
         if self.config_file.exists():
@@ -304,6 +397,7 @@ class ConfigManager:
     def set(self, key: str, value: Any):
         with self._lock:
             self.config[key] = value
+            self.version += 1
             self.get.cache_clear()
             self._save_config()
     
@@ -534,16 +628,286 @@ class SystemAwarenessMonitor:
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2)
 
+# ============================================================================
+# HISTORY RING BUFFER
+# ============================================================================
+class HistoryRing:
+    """Bounded history with O(1) append; serializes to the usual list of dicts"""
+    
+    _MISSING = object()
+    
+    def __init__(self, capacity: int, fields: Tuple[str, ...], items: Optional[List[Dict[str, Any]]] = None):
+        self.capacity = capacity
+        self.fields = fields
+        self._ts = [0.0] * capacity     # float epoch seconds, or the original string when that would not round-trip
+        self._vals = [None] * capacity  # tuple of field values, interned when strings
+        self._extra = [None] * capacity # any keys outside `fields`
+        self._start = 0
+        self._count = 0
+        for item in items or []:
+            self.append(item)
+    
+    @staticmethod
+    def _encode_ts(value: Any) -> Any:
+        """Naive local ISO strings become floats; anything else (a UTC offset, another
+        precision or format) is kept verbatim so the stored history stays lossless"""
+        if isinstance(value, str):
+            try:
+                parsed = datetime.fromisoformat(value)
+            except ValueError:
+                return value
+            if parsed.tzinfo is None:
+                epoch = parsed.timestamp()
+                if datetime.fromtimestamp(epoch).isoformat() == value:
+                    return epoch
+            return value
+        return (value,) if isinstance(value, float) else value  # a stored float must not read back as ISO
+    
+    @staticmethod
+    def _decode_ts(value: Any) -> Any:
+        if isinstance(value, float):
+            return datetime.fromtimestamp(value).isoformat()
+        return value[0] if isinstance(value, tuple) else value
+    
+    def append(self, item: Dict[str, Any]):
+        missing = self._MISSING
+        vals = tuple(sys.intern(v) if isinstance(v, str) else v
+                     for v in (item.get(f, missing) for f in self.fields))
+        extra = {k: v for k, v in item.items() if k != "timestamp" and k not in self.fields} or None
+        if self._count < self.capacity:
+            slot = (self._start + self._count) % self.capacity
+            self._count += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._ts[slot] = self._encode_ts(item.get("timestamp"))
+        self._vals[slot] = vals
+        self._extra[slot] = extra
+    
+    def _entry(self, slot: int) -> Dict[str, Any]:
+        entry = {f: v for f, v in zip(self.fields, self._vals[slot]) if v is not self._MISSING}
+        if self._extra[slot]:
+            entry.update(self._extra[slot])
+        if self._ts[slot] is not None:
+            entry["timestamp"] = self._decode_ts(self._ts[slot])
+        return entry
+    
+    def tail(self, k: int) -> List[Dict[str, Any]]:
+        """Newest k entries, oldest first"""
+        k = max(0, min(k, self._count))
+        first = self._count - k
+        return [self._entry((self._start + i) % self.capacity) for i in range(first, self._count)]
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        return self.tail(self._count)
+    
+    def copy(self) -> 'HistoryRing':
+        clone = HistoryRing.__new__(HistoryRing)
+        clone.capacity, clone.fields = self.capacity, self.fields
+        clone._ts, clone._vals, clone._extra = self._ts[:], self._vals[:], self._extra[:]
+        clone._start, clone._count = self._start, self._count
+        return clone
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __iter__(self):
+        return iter(self.to_list())
+
+# ============================================================================
+# SQLITE DATA STORE
+# ============================================================================
+class SQLiteDataStore:
+    """SQLite tables for the history collections, indexed on timestamp. Dict sections are stored
+    one row per key in section_entries; other sections are one JSON row each in sections."""
+    
+    COLLECTIONS = (
+        "command_history", "music_history", "call_history", "file_operations",
+        "whatsapp_messages", "response_log", "reminders", "notes",
+    )
+    # Row in `sections` written in the same transaction as the legacy import
+    MIGRATION_MARKER = "_migrated"
+    
+    def __init__(self, db_file: Path):
+        self.db_file = Path(db_file)
+        self.conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+    
+    def _create_schema(self):
+        with self.conn:
+            for table in self.COLLECTIONS:
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, payload TEXT NOT NULL)"
+                )
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_timestamp ON {table}(timestamp)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS sections (name TEXT PRIMARY KEY, payload TEXT NOT NULL)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS section_entries ("
+                "section TEXT NOT NULL, key TEXT NOT NULL, payload TEXT NOT NULL, PRIMARY KEY (section, key))"
+            )
+            # Databases written before section_entries existed hold dict sections as one row
+            for name, payload in self.conn.execute("SELECT name, payload FROM sections").fetchall():
+                value = json.loads(payload)
+                if isinstance(value, dict):
+                    self._put_section(name, value)
+    
+    @staticmethod
+    def _row(item: Dict[str, Any]) -> Tuple[str, str]:
+        timestamp = item.get("timestamp") or item.get("created") or datetime.now().isoformat()
+        return str(timestamp), json.dumps(item, separators=(',', ':'))
+    
+    def insert(self, table: str, item: Dict[str, Any]) -> int:
+        with self.conn:
+            cursor = self.conn.execute(f"INSERT INTO {table} (timestamp, payload) VALUES (?, ?)", self._row(item))
+        return cursor.lastrowid
+    
+    def insert_many(self, table: str, items: List[Dict[str, Any]]) -> int:
+        """Batch insert inside a single transaction"""
+        with self.conn:
+            self.conn.executemany(f"INSERT INTO {table} (timestamp, payload) VALUES (?, ?)",
+                                  [self._row(item) for item in items])
+        return len(items)
+    
+    def trim(self, table: str, keep: int):
+        """Drop everything but the newest `keep` rows"""
+        with self.conn:
+            self.conn.execute(
+                f"DELETE FROM {table} WHERE id <= (SELECT id FROM {table} ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (keep,)
+            )
+    
+    def recent(self, table: str, limit: int) -> List[Dict[str, Any]]:
+        """Newest `limit` rows, returned oldest first like a list tail"""
+        rows = self.conn.execute(
+            f"SELECT payload FROM {table} ORDER BY timestamp DESC, id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [json.loads(payload) for (payload,) in reversed(rows)]
+    
+    def between(self, table: str, start: str, end: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Rows with start <= timestamp < end (ISO strings), oldest first"""
+        rows = self.conn.execute(
+            f"SELECT payload FROM {table} WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp LIMIT ?",
+            (start, end, limit)
+        ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+    
+    def all(self, table: str) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(f"SELECT payload FROM {table} ORDER BY id").fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+    
+    def load_sections(self) -> Dict[str, Any]:
+        rows = self.conn.execute("SELECT name, payload FROM sections WHERE name != ?",
+                                 (self.MIGRATION_MARKER,)).fetchall()
+        sections = {name: json.loads(payload) for name, payload in rows}
+        for section, key, payload in self.conn.execute("SELECT section, key, payload FROM section_entries"):
+            sections.setdefault(section, {})[key] = json.loads(payload)
+        return sections
+    
+    def migrated(self) -> bool:
+        row = self.conn.execute("SELECT 1 FROM sections WHERE name = ?", (self.MIGRATION_MARKER,)).fetchone()
+        return row is not None
+    
+    def _mark_migrated(self):
+        self.conn.execute("INSERT OR REPLACE INTO sections (name, payload) VALUES (?, ?)",
+                          (self.MIGRATION_MARKER, json.dumps(datetime.now().isoformat())))
+    
+    def mark_migrated(self):
+        with self.conn:
+            self._mark_migrated()
+    
+    def _put_section(self, name: str, value: Any):
+        """Replace a whole section; caller owns the transaction"""
+        self.conn.execute("DELETE FROM sections WHERE name = ?", (name,))
+        self.conn.execute("DELETE FROM section_entries WHERE section = ?", (name,))
+        if isinstance(value, dict):
+            self.conn.executemany("INSERT INTO section_entries (section, key, payload) VALUES (?, ?, ?)",
+                                  [(name, str(key), json.dumps(item, separators=(',', ':')))
+                                   for key, item in value.items()])
+        else:
+            self.conn.execute("INSERT INTO sections (name, payload) VALUES (?, ?)",
+                              (name, json.dumps(value, separators=(',', ':'))))
+    
+    def save_section(self, name: str, value: Any):
+        with self.conn:
+            self._put_section(name, value)
+    
+    def set_entry(self, section: str, key: str, value: Any):
+        """Upsert one key of a dict section"""
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO section_entries (section, key, payload) VALUES (?, ?, ?)",
+                              (section, str(key), json.dumps(value, separators=(',', ':'))))
+    
+    def delete_entry(self, section: str, key: str):
+        with self.conn:
+            self.conn.execute("DELETE FROM section_entries WHERE section = ? AND key = ?", (section, str(key)))
+    
+    def import_data(self, data: Dict[str, Any]) -> Dict[str, int]:
+        """One-shot migration of a jarvis_data.json dict, committed as one transaction"""
+        counts = {}
+        with self.conn:
+            for name, value in data.items():
+                if name in self.COLLECTIONS and isinstance(value, list):
+                    rows = [self._row(item) for item in value if isinstance(item, dict)]
+                    self.conn.executemany(f"INSERT INTO {name} (timestamp, payload) VALUES (?, ?)", rows)
+                    counts[name] = len(rows)
+                else:
+                    self._put_section(name, value)
+            self._mark_migrated()
+        return counts
+    
+    def close(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
 # ============================================================================
 # DATA MANAGER
 # ============================================================================
 class DataManager:
-    def __init__(self, data_file: str = "jarvis_data.json"):
+    """Persistent JARVIS data stored as a full JSON file ('json'), an append-only
+    journal ('journal') or an indexed SQLite database ('sqlite')"""
+    
+    HISTORY_LIMITS = {"command_history": 1000, "music_history": 500, "call_history": 500, "response_log": 100}
+    HISTORY_FIELDS = {
+        "command_history": ("command",),
+        "music_history": ("title", "artist"),
+        "call_history": ("type", "contact", "status"),
+        "response_log": ("response",),
+    }
+    
+    def __init__(self, data_file: str = "jarvis_data.json", storage_mode: str = "json",
+                 journal_compact_bytes: int = 256 * 1024, autosave_interval: float = 5.0):
         self.data_file = Path(data_file)
-        self.data = self._load_data()
+        self.storage_mode = storage_mode if storage_mode in ("json", "journal", "sqlite") else "json"
+        self.journal_file = self.data_file.with_suffix('.journal')
+        self.store = None
+        self.journal_compact_bytes = journal_compact_bytes
+        self._journal_seq = 0
+        self._journal_handle = None
+        self._journal_bytes = 0
+        self._compacting = False
+        self._compact_lock = threading.Lock()
         self._lock = threading.RLock()
+        self.data = self._load_data()
         self._dirty = False
         self._shutdown = False
+        if self.storage_mode == "journal":
+            self._open_journal()
+        
+        # Debounced autosave: mutations only set an event, a flusher thread writes
+        self.autosave_interval = autosave_interval
+        self.flush_stats = {'flushes': 0, 'last_latency_ms': 0.0, 'last_bytes': 0, 'total_bytes': 0}
+        self._save_lock = threading.Lock()
+        self._dirty_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._flusher = None
+        if self.storage_mode == "json" and autosave_interval > 0:
+            self._flusher = threading.Thread(target=self._autosave_loop, daemon=True)
+            self._flusher.start()
     
     def _load_data(self) -> Dict[str, Any]:
         default_data = {
@@ -561,68 +925,326 @@ class DataManager:
             "music_history": [],
         }
         
+        if self.storage_mode == "sqlite":
+            return self._load_sqlite(default_data)
+        
+        self._load_json(default_data)
+        for key, fields in self.HISTORY_FIELDS.items():
+            items = default_data.get(key)
+            default_data[key] = HistoryRing(self.HISTORY_LIMITS[key], fields,
+                                            items if isinstance(items, list) else [])
+        if self.storage_mode == "journal":
+            self._replay_journal(default_data)
+        return default_data
+    
+    def _load_json(self, data: Dict[str, Any]):
         if self.data_file.exists():
             try:
                 with open(self.data_file, 'r') as f:
                     loaded = json.load(f)
-                    default_data.update(loaded)
+                    self._journal_seq = loaded.pop("_journal_seq", 0)
+                    data.update(loaded)
             except Exception as e:
                 logger.error(f"Error loading data: {e}")
-        return default_data
+    
+    def _load_sqlite(self, default_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Open the database; until the migration marker is committed, import jarvis_data.json
+        (and any journal tail) so an interrupted import is retried on the next start"""
+        db_file = self.data_file.with_suffix('.db')
+        self.store = SQLiteDataStore(db_file)
+        
+        if not self.store.migrated():
+            if self.data_file.exists() or self._journal_segments():
+                legacy = dict(default_data)
+                self._load_json(legacy)
+                self._replay_journal(legacy)
+                counts = self.store.import_data(legacy)
+                logger.info(f"Imported {sum(counts.values())} records from {self.data_file.name} into {db_file.name}")
+            else:
+                self.store.mark_migrated()
+        
+        # Only the small dict/list sections live in memory; collections stay in SQLite
+        data = {k: v for k, v in default_data.items() if k not in SQLiteDataStore.COLLECTIONS}
+        data.update(self.store.load_sections())
+        return data
+    
+    # ------------------------------------------------------------------
+    # Mutation primitives (shared by live calls and journal replay)
+    # ------------------------------------------------------------------
+    def _apply(self, data: Dict[str, Any], record: Dict[str, Any]):
+        op = record.get("op")
+        if op == "append":
+            items = data.setdefault(record["key"], [])
+            items.append(record["item"])
+            limit = self.HISTORY_LIMITS.get(record["key"])
+            if limit and isinstance(items, list) and len(items) > limit:
+                data[record["key"]] = items[-limit:]
+        elif op == "set":
+            data.setdefault(record["key"], {})[record["field"]] = record["value"]
+        elif op == "delete":
+            data.get(record["key"], {}).pop(record["field"], None)
+    
+    def _mutate(self, record: Dict[str, Any]):
+        with self._lock:
+            if self.store:
+                self._store_apply(record)
+                return
+            self._apply(self.data, record)
+            self._dirty = True
+            if self.storage_mode == "journal":
+                self._journal_append(record)
+            else:
+                self._dirty_event.set()
+    
+    def _store_apply(self, record: Dict[str, Any]):
+        """SQLite mode: collections become row inserts, dict fields single-row upserts,
+        and other sections are rewritten whole"""
+        key = record["key"]
+        try:
+            if record.get("op") == "append" and key in SQLiteDataStore.COLLECTIONS:
+                rowid = self.store.insert(key, record["item"])
+                limit = self.HISTORY_LIMITS.get(key)
+                # Trim in batches rather than on every insert
+                if limit and rowid % 100 == 0:
+                    self.store.trim(key, limit)
+            else:
+                self._apply(self.data, record)
+                if record.get("op") == "set":
+                    self.store.set_entry(key, record["field"], record["value"])
+                elif record.get("op") == "delete":
+                    self.store.delete_entry(key, record["field"])
+                else:
+                    self.store.save_section(key, self.data[key])
+        except sqlite3.Error as e:
+            logger.error(f"SQLite write error: {e}")
+    
+    def get_recent(self, key: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Newest `limit` entries of a history collection, oldest first"""
+        if self.store and key in SQLiteDataStore.COLLECTIONS:
+            with self._lock:
+                return self.store.recent(key, limit)
+        items = self.data.get(key, [])
+        if isinstance(items, HistoryRing):
+            return items.tail(limit)
+        return list(items[-limit:])
+    
+    def get_between(self, key: str, start: datetime, end: datetime, limit: int = 100) -> List[Dict[str, Any]]:
+        """Entries of a history collection with start <= timestamp < end"""
+        if self.store and key in SQLiteDataStore.COLLECTIONS:
+            with self._lock:
+                return self.store.between(key, start.isoformat(), end.isoformat(), limit)
+        start_iso, end_iso = start.isoformat(), end.isoformat()
+        return [item for item in self.data.get(key, [])
+                if start_iso <= item.get("timestamp", "") < end_iso][:limit]
+    
+    def _append(self, key: str, item: Dict[str, Any]):
+        self._mutate({"op": "append", "key": key, "item": item})
+    
+    # ------------------------------------------------------------------
+    # Journal storage
+    # ------------------------------------------------------------------
+    def _journal_segments(self) -> List[Path]:
+        """Rotated segment (left by an unfinished compaction) first, then the live journal"""
+        rotated = self.journal_file.with_suffix('.journal.1')
+        return [p for p in (rotated, self.journal_file) if p.exists()]
+    
+    def _replay_journal(self, data: Dict[str, Any]):
+        replayed = 0
+        for segment in self._journal_segments():
+            try:
+                with open(segment, 'r') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            logger.warning(f"Skipping torn journal record in {segment.name}")
+                            continue
+                        seq = record.get("seq", 0)
+                        if seq <= self._journal_seq:
+                            continue  # already folded into the snapshot
+                        self._apply(data, record)
+                        self._journal_seq = seq
+                        replayed += 1
+            except Exception as e:
+                logger.error(f"Error replaying journal {segment}: {e}")
+        if replayed:
+            logger.info(f"Replayed {replayed} journal records")
+    
+    def _open_journal(self):
+        self._journal_handle = open(self.journal_file, 'a', encoding='utf-8')
+        self._journal_bytes = self.journal_file.stat().st_size
+    
+    def _journal_append(self, record: Dict[str, Any]):
+        """Write one compact JSONL record; caller holds self._lock"""
+        self._journal_seq += 1
+        line = json.dumps(dict(record, seq=self._journal_seq), separators=(',', ':')) + "\n"
+        try:
+            self._journal_handle.write(line)
+            self._journal_handle.flush()
+            self._journal_bytes += len(line)
+        except Exception as e:
+            logger.error(f"Journal write error: {e}")
+            return
+        if self._journal_bytes >= self.journal_compact_bytes and not self._compacting and not self._shutdown:
+            self._compacting = True
+            threading.Thread(target=self.compact, daemon=True).start()
+    
+    def compact(self):
+        """Fold the journal into a fresh snapshot of jarvis_data.json"""
+        if self.storage_mode != "journal":
+            return self.save(force=True)
+        rotated = self.journal_file.with_suffix('.journal.1')
+        with self._compact_lock:
+            try:
+                with self._lock:
+                    snapshot = self._snapshot()
+                    snapshot["_journal_seq"] = self._journal_seq
+                    # Rotate so new records land in a fresh journal while the snapshot is written
+                    self._journal_handle.close()
+                    try:
+                        if rotated.exists():
+                            with open(rotated, 'a', encoding='utf-8') as dst, \
+                                    open(self.journal_file, 'r', encoding='utf-8') as src:
+                                shutil.copyfileobj(src, dst)
+                            self.journal_file.unlink()
+                        else:
+                            self.journal_file.replace(rotated)
+                    finally:
+                        # Reopen even if the rotation failed, or every later mutation would be lost
+                        self._open_journal()
+                    self._dirty = False
+                
+                self._write_snapshot(snapshot, separators=(',', ':'))
+                rotated.unlink()
+            except Exception as e:
+                logger.error(f"Journal compaction error: {e}")
+            finally:
+                self._compacting = False
     
     def save(self, force: bool = False):
+        if self.store:
+            return  # every SQLite write is committed as it happens
         if not self._dirty and not force:
             return
-        with self._lock:
-            try:
-                temp_file = self.data_file.with_suffix('.tmp')
-                with open(temp_file, 'w') as f:
-                    json.dump(self.data, f, indent=2)
-                temp_file.replace(self.data_file)
+        if self.storage_mode == "journal":
+            # Every mutation is already durable in the journal; saving means compacting
+            self.compact()
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty and not force:
+                    return
+                snapshot = self._snapshot()
                 self._dirty = False
+            try:
+                self._write_snapshot(snapshot, indent=2)
             except Exception as e:
                 logger.error(f"Error saving data: {e}")
+                with self._lock:
+                    self._dirty = True
+    
+    def _snapshot(self) -> Dict[str, Any]:
+        """Cheap point-in-time copy (caller holds self._lock); entries are never mutated in place"""
+        return {k: v.copy() if isinstance(v, HistoryRing) else list(v) if isinstance(v, list)
+                else dict(v) if isinstance(v, dict) else v
+                for k, v in self.data.items()}
+    
+    def _write_snapshot(self, snapshot: Dict[str, Any], **dump_kwargs):
+        """Serialize, fsync and atomically replace the data file, outside self._lock"""
+        start = time.perf_counter()
+        temp_file = self.data_file.with_suffix('.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(snapshot, f, default=self._json_default, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+            written = f.tell()
+        temp_file.replace(self.data_file)
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.flush_stats['flushes'] += 1
+        self.flush_stats['last_latency_ms'] = latency_ms
+        self.flush_stats['last_bytes'] = written
+        self.flush_stats['total_bytes'] += written
+        logger.debug(f"Data flushed: {written} bytes in {latency_ms:.1f}ms")
+    
+    @staticmethod
+    def _json_default(value: Any) -> Any:
+        if isinstance(value, HistoryRing):
+            return value.to_list()
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+    
+    def _autosave_loop(self):
+        while not self._stop_event.is_set():
+            self._dirty_event.wait()
+            # Coalesce every mutation that lands inside the window into one write
+            if self._stop_event.wait(self.autosave_interval):
+                break  # shutdown() performs the final flush
+            self._dirty_event.clear()
+            self.save()
     
     def log_command(self, command: str):
-        with self._lock:
-            self.data.setdefault("command_history", []).append({
-                "command": command,
-                "timestamp": datetime.now().isoformat()
-            })
-            if len(self.data["command_history"]) > 1000:
-                self.data["command_history"] = self.data["command_history"][-1000:]
-            self._dirty = True
+        self._append("command_history", {
+            "command": command,
+            "timestamp": datetime.now().isoformat()
+        })
     
     def log_music(self, title: str, artist: str = None):
-        with self._lock:
-            self.data.setdefault("music_history", []).append({
-                "title": title,
-                "artist": artist,
-                "timestamp": datetime.now().isoformat()
-            })
-            if len(self.data["music_history"]) > 500:
-                self.data["music_history"] = self.data["music_history"][-500:]
-            self._dirty = True
+        self._append("music_history", {
+            "title": title,
+            "artist": artist,
+            "timestamp": datetime.now().isoformat()
+        })
+    
+    def log_call(self, call_type: str, contact: str, status: str):
+        self._append("call_history", {
+            "type": call_type,
+            "contact": contact,
+            "status": status,
+            "timestamp": datetime.now().isoformat()
+        })
     
     def add_reminder(self, reminder: Reminder):
-        with self._lock:
-            self.data.setdefault("reminders", []).append(asdict(reminder))
-            self._dirty = True
+        self._append("reminders", asdict(reminder))
+    
+    def _collection(self, key: str) -> List[Dict[str, Any]]:
+        if self.store:
+            with self._lock:
+                return self.store.all(key)
+        return self.data.get(key, [])
     
     def get_reminders(self) -> List[Reminder]:
-        return [Reminder(**r) for r in self.data.get("reminders", [])]
+        return [Reminder(**r) for r in self._collection("reminders")]
     
     def add_note(self, note: Note):
-        with self._lock:
-            self.data.setdefault("notes", []).append(asdict(note))
-            self._dirty = True
+        self._append("notes", asdict(note))
     
     def get_notes(self) -> List[Note]:
-        return [Note(**n) for n in self.data.get("notes", [])]
+        return [Note(**n) for n in self._collection("notes")]
+    
+    def set_entry(self, section: str, field: str, value: Any):
+        """Set one field of a dict section (journaled as a single record)"""
+        self._mutate({"op": "set", "key": section, "field": field, "value": value})
+    
+    def delete_entry(self, section: str, field: str):
+        self._mutate({"op": "delete", "key": section, "field": field})
+    
+    def add_custom_command(self, phrase: str, response: str):
+        self.set_entry("custom_commands", phrase, response)
     
     def shutdown(self):
         self._shutdown = True
+        self._stop_event.set()
+        self._dirty_event.set()
+        if self._flusher:
+            self._flusher.join(timeout=2)
         self.save(force=True)
+        stats = self.flush_stats
+        if stats['flushes']:
+            logger.info(f"Data flushes: {stats['flushes']}, {stats['total_bytes']} bytes total, "
+                        f"last {stats['last_bytes']} bytes in {stats['last_latency_ms']:.1f}ms")
+        if self._journal_handle:
+            self._journal_handle.close()
+        if self.store:
+            self.store.close()
 
 # ============================================================================
 # ENHANCED LANGUAGE DETECTOR
@@ -668,21 +1290,926 @@ class EnhancedLanguageDetector(LanguageDetector):
         voices = self.tts_voices.get(lang_code, {})
         return voices.get(os_key, '')
 
+# ============================================================================
+# HTTP CLIENT
+# ============================================================================
+class DNSCache:
+    """Host -> address cache with a TTL; an entry is dropped when connecting to it fails"""
+    
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    def resolve(self, host: str, port: int) -> str:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry and entry[1] > now:
+                self.hits += 1
+                return entry[0]
+        address = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)[0][4][0]
+        with self._lock:
+            self.misses += 1
+            self._entries[host] = (address, now + self.ttl)
+        return address
+    
+    def invalidate(self, host: str):
+        with self._lock:
+            self._entries.pop(host, None)
+
+class _TimedConnectionMixin:
+    """urllib3 connection that resolves through the client's DNS cache and times each phase"""
+    
+    client = None  # the owning HttpClient, bound on the generated subclasses
+    
+    def _new_conn(self):
+        timing = self.client._timing()
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            address = self.client.dns.resolve(host, self.port)
+        except OSError:
+            return super()._new_conn()  # let urllib3 raise its usual NameResolutionError
+        resolved = time.perf_counter()
+        self._dns_host = address
+        try:
+            sock = super()._new_conn()
+        except Exception:
+            self.client.dns.invalidate(host)
+            raise
+        finally:
+            self._dns_host = host
+        if timing is not None:
+            timing['dns_ms'] = (resolved - start) * 1000
+            timing['connect_ms'] = (time.perf_counter() - resolved) * 1000
+            timing['new_connection'] = True
+        return sock
+    
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        timing = self.client._timing()
+        if timing is not None and timing['new_connection'] and isinstance(self, HTTPSConnection):
+            elapsed = (time.perf_counter() - start) * 1000
+            timing['tls_ms'] = max(0.0, elapsed - timing['dns_ms'] - timing['connect_ms'])
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    def __init__(self, client: "HttpClient", **kwargs):
+        self.client = client  # needed by init_poolmanager, which HTTPAdapter.__init__ calls
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        http_conn = type("TimedHTTPConnection", (_TimedConnectionMixin, HTTPConnection), {'client': self.client})
+        https_conn = type("TimedHTTPSConnection", (_TimedConnectionMixin, HTTPSConnection), {'client': self.client})
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type("TimedHTTPConnectionPool", (HTTPConnectionPool,), {'ConnectionCls': http_conn}),
+            'https': type("TimedHTTPSConnectionPool", (HTTPSConnectionPool,), {'ConnectionCls': https_conn}),
+        }
+
+class HttpClient:
+    """One keep-alive session for every service: per-host pools, DNS cache and per-phase timing"""
+    
+    PHASES = ('dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'total_ms')
+    
+    def __init__(self, config: Optional[ConfigManager] = None):
+        get = config.get if config else (lambda key, default=None: default)
+        self.dns = DNSCache(get('dns_cache_ttl', 300))
+        self.session = requests.Session()
+        adapter = _TimedHTTPAdapter(self, pool_connections=get('http_pool_hosts', 10),
+                                    pool_maxsize=get('http_pool_size', 8))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Connection'] = 'keep-alive'
+        self._local = threading.local()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    def _timing(self) -> Optional[Dict[str, Any]]:
+        return getattr(self._local, 'timing', None)
+    
+    @property
+    def last_timing(self) -> Dict[str, Any]:
+        """Phase timings of this thread's most recent request"""
+        return getattr(self._local, 'last_timing', {})
+    
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        timing = {'dns_ms': 0.0, 'connect_ms': 0.0, 'tls_ms': 0.0, 'ttfb_ms': 0.0, 'total_ms': 0.0,
+                  'new_connection': False}
+        self._local.timing = timing
+        start = time.perf_counter()
+        host = urlparse(url).netloc
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            self._record(host, None)
+            raise
+        finally:
+            self._local.timing = None
+            timing['total_ms'] = (time.perf_counter() - start) * 1000
+            self._local.last_timing = timing
+        # elapsed runs from sending to parsed headers, so it includes any new connection's setup
+        timing['ttfb_ms'] = max(0.0, response.elapsed.total_seconds() * 1000
+                                - timing['dns_ms'] - timing['connect_ms'] - timing['tls_ms'])
+        self._record(host, timing)
+        logger.debug(f"HTTP {method} {host}: " + ", ".join(f"{p[:-3]} {timing[p]:.0f}ms" for p in self.PHASES))
+        return response
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+    
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+    
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request('HEAD', url, **kwargs)
+    
+    def _record(self, host: str, timing: Optional[Dict[str, Any]]):
+        with self._lock:
+            stats = self._stats.setdefault(host, dict.fromkeys(('requests', 'errors', 'new_connections')
+                                                               + self.PHASES, 0.0))
+            stats['requests'] += 1
+            if timing is None:
+                stats['errors'] += 1
+                return
+            stats['new_connections'] += timing['new_connection']
+            for phase in self.PHASES:
+                stats[phase] += timing[phase]
+    
+    def warm_up(self, urls: List[str]):
+        """Resolve, connect and finish the TLS handshake for each URL in the background"""
+        def run():
+            for url in urls:
+                try:
+                    self.head(url, timeout=3, allow_redirects=False)
+                    logger.info(f"HTTP warm-up {url}: {self.last_timing['total_ms']:.0f}ms")
+                except Exception as e:
+                    logger.debug(f"HTTP warm-up {url} failed: {e}")
+        threading.Thread(target=run, daemon=True, name="http-warmup").start()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-host request counts and mean phase timings (DNS/connect/TLS over new connections only)"""
+        hosts = {}
+        with self._lock:
+            for host, stats in self._stats.items():
+                ok = stats['requests'] - stats['errors']
+                fresh = stats['new_connections']
+                hosts[host] = {
+                    'requests': int(stats['requests']),
+                    'errors': int(stats['errors']),
+                    'new_connections': int(fresh),
+                    'dns_ms': stats['dns_ms'] / fresh if fresh else 0.0,
+                    'connect_ms': stats['connect_ms'] / fresh if fresh else 0.0,
+                    'tls_ms': stats['tls_ms'] / fresh if fresh else 0.0,
+                    'ttfb_ms': stats['ttfb_ms'] / ok if ok else 0.0,
+                    'total_ms': stats['total_ms'] / ok if ok else 0.0,
+                }
+        return {'hosts': hosts, 'dns_hits': self.dns.hits, 'dns_misses': self.dns.misses}
+    
+    def close(self):
+        self.session.close()
+
+# ============================================================================
+# CIRCUIT BREAKERS
+# ============================================================================
+class CircuitOpenError(Exception):
+    """Raised by CircuitBreaker.call while its upstream is considered down"""
+
+class CircuitBreaker:
+    """Fails fast once an upstream has failed `failure_threshold` times within `window` seconds.
+    
+    After `reset_timeout` the breaker half-opens: a background probe (if given) or the next
+    caller is let through as a trial. Every failed trial doubles the wait up to `max_reset_timeout`.
+    """
+    
+    def __init__(self, name: str, failure_threshold: int = 3, window: float = 60.0,
+                 reset_timeout: float = 15.0, max_reset_timeout: float = 300.0, probe=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.probe = probe  # callable returning True when the upstream looks healthy again
+        self.state = CircuitState.CLOSED
+        self.last_error = None
+        self.stats = {'calls': 0, 'failures': 0, 'rejected': 0, 'opened': 0}
+        self._failures = deque()  # monotonic times of recent failures
+        self._opened_at = 0.0
+        self._current_reset = reset_timeout
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def _open(self, now: float):
+        """Caller holds the lock"""
+        self.state = CircuitState.OPEN
+        self._opened_at = now
+        self._trial_in_flight = False
+        self.stats['opened'] += 1
+        logger.warning(f"Circuit '{self.name}' open for {self._current_reset:.0f}s: {self.last_error}")
+    
+    def retry_in(self) -> float:
+        """Seconds until the next trial is allowed (0 when closed)"""
+        if self.state is CircuitState.CLOSED:
+            return 0.0
+        return max(0.0, self._opened_at + self._current_reset - time.monotonic())
+    
+    def allow(self) -> bool:
+        with self._lock:
+            self.stats['calls'] += 1
+            if self.state is CircuitState.CLOSED:
+                return True
+            if (self.state is CircuitState.OPEN and self.probe is None
+                    and time.monotonic() - self._opened_at >= self._current_reset):
+                self.state = CircuitState.HALF_OPEN
+                self._trial_in_flight = True  # this caller is the trial request
+                return True
+            self.stats['rejected'] += 1
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            if self.state is not CircuitState.CLOSED:
+                logger.info(f"Circuit '{self.name}' closed")
+            self.state = CircuitState.CLOSED
+            self._failures.clear()
+            self._current_reset = self.reset_timeout
+            self._trial_in_flight = False
+    
+    def record_failure(self, error: Any = None):
+        now = time.monotonic()
+        with self._lock:
+            self.stats['failures'] += 1
+            self.last_error = str(error) if error is not None else "failure"
+            if self.state is CircuitState.HALF_OPEN:
+                self._current_reset = min(self._current_reset * 2, self.max_reset_timeout)
+                self._open(now)
+                return
+            if self.state is CircuitState.OPEN:
+                return
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > self.window:
+                self._failures.popleft()
+            if len(self._failures) >= self.failure_threshold:
+                self._open(now)
+    
+    def call(self, fn, *args, fallback: Any = None, **kwargs):
+        """Run fn through the breaker; while open, return fallback (called if callable) or raise"""
+        if not self.allow():
+            if fallback is None:
+                raise CircuitOpenError(f"{self.name} unavailable")
+            return fallback() if callable(fallback) else fallback
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+    
+    def run_probe(self) -> bool:
+        """Half-open trial driven by the registry's probe thread"""
+        with self._lock:
+            if (self.state is not CircuitState.OPEN or self.probe is None
+                    or time.monotonic() - self._opened_at < self._current_reset):
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._trial_in_flight = True
+        try:
+            healthy = bool(self.probe())
+            error = None if healthy else "probe reported unhealthy"
+        except Exception as e:
+            healthy, error = False, e
+        if healthy:
+            self.record_success()
+        else:
+            self.record_failure(error)
+        return healthy
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, name=self.name, state=self.state.value,
+                        retry_in=round(self.retry_in(), 1), last_error=self.last_error)
+
+class CircuitBreakerRegistry:
+    """Shared breakers keyed by upstream name, plus one daemon thread that probes open breakers"""
+    
+    def __init__(self, config: Optional[ConfigManager] = None, probe_interval: float = 1.0):
+        self.config = config
+        self.probe_interval = probe_interval
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._probe_thread = None
+    
+    def get(self, name: str, probe=None) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                get = self.config.get if self.config else (lambda key, default=None: default)
+                breaker = self._breakers[name] = CircuitBreaker(
+                    name,
+                    failure_threshold=get('breaker_failure_threshold', 3),
+                    window=get('breaker_window', 60),
+                    reset_timeout=get('breaker_reset_timeout', 15),
+                    max_reset_timeout=get('breaker_max_reset_timeout', 300),
+                    probe=probe
+                )
+            elif probe is not None and breaker.probe is None:
+                breaker.probe = probe
+            if breaker.probe is not None and self._probe_thread is None:
+                self._probe_thread = threading.Thread(target=self._probe_loop, daemon=True, name="breaker-probe")
+                self._probe_thread.start()
+            return breaker
+    
+    def _probe_loop(self):
+        while not self._stop_event.wait(self.probe_interval):
+            with self._lock:
+                breakers = list(self._breakers.values())
+            for breaker in breakers:
+                if breaker.state is CircuitState.OPEN and breaker.retry_in() == 0:
+                    breaker.run_probe()
+    
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        """Breaker snapshots for status displays (the HUD polls this)"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
+    
+    def shutdown(self):
+        self._stop_event.set()
+
 # ============================================================================
 # YOUTUBE MUSIC CONTROLLER
 # ============================================================================
+class YouTubeExtractor:
+    """Long-lived yt-dlp instances plus query->results and video->stream URL caches.
+    
+    Stream URLs are signed; each is trusted until its own `expire` parameter (minus a margin).
+    """
+    
+    VIDEO_ID = re.compile(r'(?:v=|youtu\.be/|/shorts/|/embed/)([A-Za-z0-9_-]{11})')
+    EXPIRE = re.compile(r'[?&/]expire[=/](\d+)')
+    
+    def __init__(self, config: ConfigManager):
+        self.config = config
+        self.search_ttl = config.get('youtube_search_ttl', 86400)
+        self.stream_ttl = config.get('youtube_stream_ttl', 3600)  # for URLs without an expire parameter
+        self.max_entries = config.get('youtube_cache_entries', 256)
+        self.stats = {'search_hits': 0, 'search_misses': 0, 'stream_hits': 0, 'stream_misses': 0,
+                      'stream_expired': 0}
+        self._searches = OrderedDict()  # normalized query -> (expires, max_results, results)
+        self._streams = OrderedDict()   # (video key, audio_only) -> (expires, info)
+        self._cache_lock = threading.Lock()
+        self._instances: Dict[str, Any] = {}  # 'search' / 'audio' / 'video' -> YoutubeDL
+        self._instance_locks = {name: threading.Lock() for name in ('search', 'audio', 'video')}
+        self._create_lock = threading.Lock()
+    
+    def _ydl(self, kind: str):
+        """YoutubeDL instances are expensive to build, so one per kind lives for the session"""
+        with self._create_lock:
+            ydl = self._instances.get(kind)
+            if ydl is None:
+                opts = {
+                    'quiet': True,
+                    'no_warnings': True,
+                    'socket_timeout': self.config.get('youtube_timeout', 10),
+                }
+                if kind == 'search':
+                    opts.update({'extract_flat': True, 'force_generic_extractor': False})
+                else:
+                    opts['format'] = 'bestaudio/best' if kind == 'audio' else 'best'
+                ydl = self._instances[kind] = youtube_dl.YoutubeDL(opts)
+            return ydl
+    
+    def _extract(self, kind: str, url: str) -> Optional[Dict[str, Any]]:
+        ydl = self._ydl(kind)
+        with self._instance_locks[kind]:  # YoutubeDL is not thread-safe
+            return ydl.extract_info(url, download=False)
+    
+    @classmethod
+    def video_key(cls, url: str) -> str:
+        match = cls.VIDEO_ID.search(url)
+        return match.group(1) if match else url
+    
+    def _store(self, cache: OrderedDict, key: Any, value: tuple):
+        """Caller holds the cache lock"""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_entries:
+            cache.popitem(last=False)
+    
+    @staticmethod
+    def _query_key(query: str) -> str:
+        return ' '.join(query.lower().split())
+    
+    def cached_search(self, query: str, max_results: int = 5) -> Optional[List[Dict[str, Any]]]:
+        key = self._query_key(query)
+        with self._cache_lock:
+            entry = self._searches.get(key)
+            if entry and entry[0] > time.time() and entry[1] >= max_results:
+                self._searches.move_to_end(key)
+                self.stats['search_hits'] += 1
+                return entry[2][:max_results]
+            self.stats['search_misses'] += 1
+            return None
+    
+    def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Run the search upstream and cache the results (callers try cached_search first)"""
+        info = self._extract('search', f"ytsearch{max_results}:{query}")
+        results = []
+        for entry in (info or {}).get('entries') or []:
+            if entry:
+                results.append({
+                    'id': entry.get('id', ''),
+                    'title': entry.get('title', 'Unknown'),
+                    'url': f"https://www.youtube.com/watch?v={entry.get('id', '')}",
+                    'duration': entry.get('duration', 0),
+                    'thumbnail': entry.get('thumbnail', ''),
+                    'uploader': entry.get('uploader', 'Unknown'),
+                })
+        if results:
+            with self._cache_lock:
+                self._store(self._searches, self._query_key(query),
+                            (time.time() + self.search_ttl, max_results, results))
+        return results
+    
+    def _url_expiry(self, stream_url: str) -> float:
+        match = self.EXPIRE.search(stream_url or "")
+        if match:
+            return int(match.group(1)) - 60  # leave a minute for the player to open it
+        return time.time() + self.stream_ttl
+    
+    def has_stream(self, url: str, audio_only: bool = True) -> bool:
+        """Whether a still-valid stream URL is cached (does not touch the hit/miss stats)"""
+        with self._cache_lock:
+            entry = self._streams.get((self.video_key(url), audio_only))
+            return bool(entry and entry[0] > time.time())
+    
+    def cached_stream(self, url: str, audio_only: bool = True) -> Optional[Dict[str, Any]]:
+        key = (self.video_key(url), audio_only)
+        with self._cache_lock:
+            entry = self._streams.get(key)
+            if entry and entry[0] > time.time():
+                self._streams.move_to_end(key)
+                self.stats['stream_hits'] += 1
+                return entry[1]
+            self.stats['stream_expired' if entry else 'stream_misses'] += 1
+            return None
+    
+    def resolve(self, url: str, audio_only: bool = True) -> Optional[Dict[str, Any]]:
+        """Full extraction (title, uploader, duration, direct stream 'url') for a video page URL"""
+        key = (self.video_key(url), audio_only)
+        info = self._extract('audio' if audio_only else 'video', url)
+        if not info:
+            return None
+        keep = {k: info[k] for k in ('id', 'title', 'uploader', 'duration', 'thumbnail', 'url')
+                if info.get(k) is not None}
+        with self._cache_lock:
+            self._store(self._streams, key, (self._url_expiry(keep.get('url')), keep))
+        return keep
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._cache_lock:
+            return dict(self.stats, searches=len(self._searches), streams=len(self._streams))
+    
+    def close(self):
+        with self._create_lock:
+            for ydl in self._instances.values():
+                try:
+                    ydl.__exit__(None, None, None)
+                except Exception:
+                    pass
+            self._instances.clear()
+
+class AudioCache:
+    """Downloaded audio in music_cache_dir keyed by video id, LRU-evicted under a byte budget.
+    
+    index.json maps video id -> file and track metadata (plus query -> video id and
+    per-video play counts), so a cached replay needs no network at all. Lookups and
+    plays only mark the index dirty; a flusher thread rewrites it at most once per
+    flush_interval, and close() writes it a final time.
+    """
+    
+    INDEX_FILE = "index.json"
+    MAX_QUERIES = 1024
+    MAX_PLAY_COUNTS = 2048
+    
+    def __init__(self, cache_dir: Path, max_bytes: int = 1024 ** 3, socket_timeout: float = 10,
+                 flush_interval: float = 2.0):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.socket_timeout = socket_timeout
+        self.stats = {'hits': 0, 'misses': 0, 'downloads': 0, 'download_errors': 0, 'evictions': 0}
+        self._entries = OrderedDict()  # video id -> {'file', 'bytes', 'title', 'uploader', 'duration', 'last_played'}
+        self._queries = OrderedDict()  # normalized query -> video id
+        self._plays = OrderedDict()    # video id -> times played, most recently played last
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._jobs = queue.Queue()
+        self._worker = None
+        self._ydl = None
+        self._load_index()
+        
+        # Debounced index writes, as in DataManager's autosave
+        self.flush_interval = flush_interval
+        self._dirty = False
+        self._save_lock = threading.Lock()
+        self._dirty_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._flusher = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name="audio-cache-index")
+            self._flusher.start()
+    
+    @staticmethod
+    def query_key(query: str) -> str:
+        return ' '.join(query.lower().split())
+    
+    def _load_index(self):
+        index_path = self.cache_dir / self.INDEX_FILE
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        entries = sorted(index.get('tracks', {}).items(), key=lambda kv: kv[1].get('last_played', 0))
+        for video_id, entry in entries:
+            if (self.cache_dir / entry.get('file', '')).is_file():
+                self._entries[video_id] = entry
+                self._bytes += entry.get('bytes', 0)
+        self._queries.update(index.get('queries', {}))
+        self._plays.update(index.get('plays', {}))
+    
+    def _mark_dirty(self):
+        """Schedule an index write; caller holds the lock. Without a flusher the write happens now."""
+        self._dirty = True
+        if self._flusher is None:
+            self._dirty = not self._write_index(self._index_payload())
+        else:
+            self._dirty_event.set()
+    
+    def _index_payload(self) -> str:
+        """Caller holds the lock"""
+        return json.dumps({'tracks': self._entries, 'queries': self._queries, 'plays': self._plays})
+    
+    def _write_index(self, payload: str) -> bool:
+        """Atomic rewrite of index.json"""
+        index_path = self.cache_dir / self.INDEX_FILE
+        tmp_path = index_path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, index_path)
+            return True
+        except OSError as e:
+            logger.error(f"Audio cache index write failed: {e}")
+            return False
+    
+    def flush(self):
+        """Write index.json if anything changed since the last write"""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                payload = self._index_payload()
+                self._dirty = False
+            if not self._write_index(payload):
+                with self._lock:
+                    self._dirty = True
+    
+    def _flush_loop(self):
+        while not self._stop_event.is_set():
+            self._dirty_event.wait()
+            # Coalesce every hit and play inside the window into one write
+            if self._stop_event.wait(self.flush_interval):
+                break  # close() performs the final write
+            self._dirty_event.clear()
+            self.flush()
+    
+    def lookup(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Cached track with its local 'path', or None; a hit refreshes its LRU position"""
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None or not (self.cache_dir / entry['file']).is_file():
+                if entry is not None:  # file removed behind our back
+                    self._bytes -= self._entries.pop(video_id).get('bytes', 0)
+                self.stats['misses'] += 1
+                return None
+            entry['last_played'] = time.time()
+            self._entries.move_to_end(video_id)
+            self.stats['hits'] += 1
+            self._mark_dirty()
+            return dict(entry, path=str(self.cache_dir / entry['file']))
+    
+    def video_for_query(self, query: str) -> Optional[str]:
+        with self._lock:
+            return self._queries.get(self.query_key(query))
+    
+    def remember_query(self, query: str, video_id: str):
+        with self._lock:
+            key = self.query_key(query)
+            if self._queries.get(key) == video_id:
+                return
+            self._queries[key] = video_id
+            self._queries.move_to_end(key)
+            while len(self._queries) > self.MAX_QUERIES:
+                self._queries.popitem(last=False)
+            self._mark_dirty()
+    
+    def record_play(self, video_id: str) -> int:
+        """Count a streamed play of video_id; returns its total"""
+        with self._lock:
+            plays = self._plays.pop(video_id, 0) + 1
+            self._plays[video_id] = plays
+            while len(self._plays) > self.MAX_PLAY_COUNTS:
+                self._plays.popitem(last=False)
+            self._mark_dirty()
+            return plays
+    
+    def request(self, video_id: str, url: str, meta: Optional[Dict[str, Any]] = None):
+        """Queue a background download unless the track is cached or already queued"""
+        with self._lock:
+            if video_id in self._entries or video_id in self._pending:
+                return
+            self._pending.add(video_id)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._download_loop, daemon=True, name="audio-cache")
+                self._worker.start()
+        self._jobs.put((video_id, url, meta or {}))
+    
+    def _downloader(self):
+        if self._ydl is None:
+            self._ydl = youtube_dl.YoutubeDL({
+                'format': 'bestaudio/best',
+                'quiet': True,
+                'no_warnings': True,
+                'socket_timeout': self.socket_timeout,
+                'outtmpl': str(self.cache_dir / '%(id)s.%(ext)s'),
+            })
+        return self._ydl
+    
+    def _download_loop(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            video_id, url, meta = job
+            try:
+                info = self._downloader().extract_info(url, download=True)
+                downloads = info.get('requested_downloads') or [{}]
+                path = Path(downloads[0].get('filepath') or self._downloader().prepare_filename(info))
+                self._add(video_id, path, dict(meta, title=info.get('title', meta.get('title')),
+                                               uploader=info.get('uploader', meta.get('uploader')),
+                                               duration=info.get('duration', meta.get('duration'))))
+            except Exception as e:
+                self.stats['download_errors'] += 1
+                logger.warning(f"Audio cache download failed for {video_id}: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(video_id)
+    
+    def _add(self, video_id: str, path: Path, meta: Dict[str, Any]):
+        size = path.stat().st_size
+        with self._lock:
+            previous = self._entries.pop(video_id, None)
+            if previous:
+                self._bytes -= previous.get('bytes', 0)
+            self._entries[video_id] = {
+                'file': path.name, 'bytes': size, 'title': meta.get('title'),
+                'uploader': meta.get('uploader'), 'duration': meta.get('duration'),
+                'last_played': time.time(),
+            }
+            self._bytes += size
+            self.stats['downloads'] += 1
+            while self._bytes > self.max_bytes and self._entries:
+                old_id, old = self._entries.popitem(last=False)
+                self._bytes -= old.get('bytes', 0)
+                self.stats['evictions'] += 1
+                try:
+                    (self.cache_dir / old['file']).unlink()
+                except OSError:
+                    pass
+            self._mark_dirty()
+        logger.info(f"Cached audio for {meta.get('title', video_id)} ({size // 1024} KB, "
+                    f"cache {self._bytes // (1024 * 1024)} MB)")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, tracks=len(self._entries), bytes=self._bytes)
+    
+    def close(self):
+        self._stop_event.set()
+        self._dirty_event.set()
+        if self._flusher:
+            self._flusher.join(timeout=2)
+        self.flush()
+        if self._worker:
+            self._jobs.put(None)
+        if self._ydl is not None:
+            try:
+                self._ydl.__exit__(None, None, None)
+            except Exception:
+                pass
+
+class PlaybackEngine:
+    """One thread that tracks the state of any number of VLC players and publishes it to subscribers.
+    
+    VLC event-manager callbacks only enqueue (libvlc must not be called back from inside its own
+    callbacks); the engine thread reads player details and notifies subscribers, and hands
+    end-of-track handlers to a worker so their network work never holds up later events.
+    Players without an event manager are polled by the same thread instead.
+    """
+    
+    EVENT_TYPES = ('playing', 'paused', 'stopped', 'ended', 'error', 'position')
+    VLC_EVENTS = (
+        ('MediaPlayerPlaying', 'playing'),
+        ('MediaPlayerPaused', 'paused'),
+        ('MediaPlayerStopped', 'stopped'),
+        ('MediaPlayerEndReached', 'ended'),
+        ('MediaPlayerEncounteredError', 'error'),
+        ('MediaPlayerPositionChanged', 'position'),
+    )
+    
+    def __init__(self, position_interval: float = 1.0):
+        self.position_interval = position_interval
+        self._events = queue.Queue()
+        self._players: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: Dict[int, Tuple[Any, Optional[frozenset]]] = {}
+        self._next_token = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._end_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="playback-end")
+        self.stats = {'events': 0, 'published': 0, 'polls': 0, 'subscriber_errors': 0}
+    
+    def attach(self, name: str, player, on_end=None, describe=None) -> bool:
+        """Track a player; on_end runs on the end-of-track worker when a track finishes, describe() names the media.
+        Returns True when VLC events drive the player, False when it falls back to polling."""
+        entry = {
+            'player': player, 'on_end': on_end, 'describe': describe, 'polled': False,
+            'state': 'stopped', 'position': 0.0, 'time_ms': 0, 'length_ms': 0, 'last_position': 0.0,
+        }
+        try:
+            manager = player.event_manager()
+            for vlc_event, kind in self.VLC_EVENTS:
+                manager.event_attach(getattr(vlc.EventType, vlc_event), self._on_vlc_event, name, kind)
+        except Exception as e:
+            logger.warning(f"Player '{name}' has no usable event manager, polling instead: {e}")
+            entry['polled'] = True
+        with self._lock:
+            self._players[name] = entry
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="playback-engine", daemon=True)
+                self._thread.start()
+        self._events.put((name, 'attached', None))  # wake the thread so it picks up polling
+        return not entry['polled']
+    
+    def subscribe(self, callback, types=None) -> int:
+        """Call callback(event) for every published event (or only those whose type is in types).
+        Callbacks run on the engine thread and should return quickly."""
+        with self._lock:
+            self._next_token += 1
+            self._subscribers[self._next_token] = (callback, frozenset(types) if types else None)
+            return self._next_token
+    
+    def unsubscribe(self, token: int):
+        with self._lock:
+            self._subscribers.pop(token, None)
+    
+    def snapshot(self, name: str) -> Dict[str, Any]:
+        """Last known state of a player"""
+        with self._lock:
+            entry = self._players.get(name)
+            if not entry:
+                return {'player': name, 'state': 'stopped', 'position': 0.0, 'time_ms': 0, 'length_ms': 0}
+            return {'player': name, 'state': entry['state'], 'position': entry['position'],
+                    'time_ms': entry['time_ms'], 'length_ms': entry['length_ms']}
+    
+    def _on_vlc_event(self, event, name: str, kind: str):
+        """Runs on a libvlc thread: enqueue only"""
+        if kind == 'position':
+            entry = self._players.get(name)
+            now = time.monotonic()
+            if entry is None or now - entry['last_position'] < self.position_interval:
+                return
+            entry['last_position'] = now
+            self._events.put((name, kind, event.u.new_position))
+        else:
+            self._events.put((name, kind, None))
+    
+    def _run(self):
+        while True:
+            with self._lock:
+                polling = any(entry['polled'] for entry in self._players.values())
+            try:
+                item = self._events.get(timeout=self.position_interval if polling else None)
+            except queue.Empty:
+                self._poll()
+                continue
+            if item is None:
+                break
+            name, kind, value = item
+            if kind != 'attached':
+                self._handle(name, kind, value)
+    
+    def _handle(self, name: str, kind: str, value: Optional[float] = None):
+        entry = self._players.get(name)
+        if entry is None:
+            return
+        self.stats['events'] += 1
+        player = entry['player']
+        try:
+            entry['time_ms'] = max(0, player.get_time() or 0)
+            entry['length_ms'] = max(0, player.get_length() or 0)
+            entry['position'] = value if value is not None else max(0.0, player.get_position() or 0.0)
+        except Exception:
+            pass
+        if kind == 'ended':
+            entry['position'] = 1.0
+        if kind != 'position':
+            entry['state'] = kind
+        
+        self._publish(name, kind, entry)
+        
+        if kind == 'ended' and entry['on_end']:
+            self._end_worker.submit(self._run_on_end, name, entry['on_end'])
+    
+    @staticmethod
+    def _run_on_end(name: str, on_end):
+        try:
+            on_end()
+        except Exception as e:
+            logger.error(f"End-of-track handler for '{name}' failed: {e}")
+    
+    def _publish(self, name: str, kind: str, entry: Dict[str, Any]):
+        media = None
+        if entry['describe']:
+            try:
+                media = entry['describe']()
+            except Exception:
+                pass
+        event = {
+            'player': name, 'type': kind, 'state': entry['state'], 'media': media,
+            'position': entry['position'], 'time_ms': entry['time_ms'], 'length_ms': entry['length_ms'],
+        }
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for callback, types in subscribers:
+            if types is not None and kind not in types:
+                continue
+            try:
+                callback(event)
+                self.stats['published'] += 1
+            except Exception as e:
+                self.stats['subscriber_errors'] += 1
+                logger.error(f"Playback subscriber error: {e}")
+    
+    def _poll(self):
+        """Fallback for players without an event manager: derive the same events from get_state()"""
+        self.stats['polls'] += 1
+        states = {vlc.State.Playing: 'playing', vlc.State.Paused: 'paused', vlc.State.Stopped: 'stopped',
+                  vlc.State.Ended: 'ended', vlc.State.Error: 'error'} if VLC_AVAILABLE else {}
+        with self._lock:
+            players = list(self._players.items())
+        for name, entry in players:
+            if not entry['polled']:
+                continue
+            try:
+                state = states.get(entry['player'].get_state())
+            except Exception:
+                continue
+            if state and state != entry['state']:
+                self._handle(name, state)
+            elif state == 'playing':
+                self._handle(name, 'position')
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, players=len(self._players), subscribers=len(self._subscribers))
+    
+    def stop(self, timeout: float = 2.0):
+        if self._thread:
+            self._events.put(None)
+            self._thread.join(timeout)
+        self._end_worker.shutdown(wait=False)
+
 class YouTubeMusicController:
     """Advanced YouTube music and video playback controller"""
     
-    def __init__(self, config: ConfigManager, data_manager: DataManager):
+    def __init__(self, config: ConfigManager, data_manager: DataManager,
+                 breakers: Optional[CircuitBreakerRegistry] = None, http: Optional[HttpClient] = None):
         self.config = config
         self.data_manager = data_manager
+        self.http = http or HttpClient(config)
+        self.breaker = (breakers or CircuitBreakerRegistry(config)).get('youtube', probe=self._probe_youtube)
         self.current_media = None
         self.playlist = []
+        self.playlist_index = -1  # position of current_media in playlist; -1 when playing outside it
         self.is_playing = False
         self.volume = config.get('music_volume', 70)
-        self.playback_thread = None
-        self.stop_event = threading.Event()
         
         # VLC player for local playback
         self.vlc_player = None
@@ -693,52 +2220,72 @@ class YouTubeMusicController:
             except:
                 self.vlc_player = None
         
+        # Playback state arrives as VLC events on one engine thread; subscribe() to follow it
+        self.playback = PlaybackEngine(config.get('playback_position_interval', 1.0))
+        if self.vlc_player:
+            self.playback.attach('music', self.vlc_player, on_end=self._play_next, describe=self._describe_media)
+            self.playback.subscribe(self._on_playback_event, types=('playing', 'paused', 'stopped', 'ended', 'error'))
+        
         # Cache directory for downloads
         self.cache_dir = Path(config.get('music_cache_dir', str(Path.home() / ".jarvis_music_cache")))
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Reused yt-dlp instances with search and stream-URL caches
+        self.extractor = YouTubeExtractor(config) if YOUTUBE_DL_AVAILABLE else None
+        
+        # Frequently played tracks are downloaded and replayed from disk
+        self.audio_cache = AudioCache(
+            self.cache_dir,
+            max_bytes=config.get('music_cache_max_bytes', 1024 ** 3),
+            socket_timeout=config.get('youtube_timeout', 10),
+            flush_interval=config.get('music_cache_flush_interval', 2)
+        ) if YOUTUBE_DL_AVAILABLE else None
+        self.cache_min_plays = config.get('music_cache_min_plays', 2)
+        
+        # Resolve upcoming playlist tracks while the current one plays
+        self.prefetch_depth = config.get('music_prefetch_tracks', 2)
+        self._prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="music-prefetch")
+        self._prefetch_pending = set()
+        self._prefetch_lock = threading.Lock()
+    
+    def _probe_youtube(self) -> bool:
+        return self.http.head("https://www.youtube.com", timeout=3).status_code < 500
     
     @safe_execution
     def search_youtube(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
         """Search YouTube for videos"""
         if not YOUTUBE_DL_AVAILABLE:
             return []
+        cached = self.extractor.cached_search(query, max_results)
+        if cached is not None:
+            return cached
+        if not self.breaker.allow():
+            logger.warning(f"YouTube search skipped, circuit open (retry in {self.breaker.retry_in():.0f}s)")
+            return []
         
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': True,
-                'force_generic_extractor': False,
-            }
-            
-            with youtube_dl.YoutubeDL(ydl_opts) as ydl:
-                search_query = f"ytsearch{max_results}:{query}"
-                info = ydl.extract_info(search_query, download=False)
-                
-                if 'entries' in info:
-                    results = []
-                    for entry in info['entries']:
-                        if entry:
-                            results.append({
-                                'title': entry.get('title', 'Unknown'),
-                                'url': f"https://www.youtube.com/watch?v={entry.get('id', '')}",
-                                'duration': entry.get('duration', 0),
-                                'thumbnail': entry.get('thumbnail', ''),
-                                'uploader': entry.get('uploader', 'Unknown'),
-                            })
-                    return results
-            
-            return []
+            results = self.extractor.search(query, max_results)
+            self.breaker.record_success()
+            return results
         except Exception as e:
+            self.breaker.record_failure(e)
             logger.error(f"YouTube search error: {e}")
             return []
     
     @safe_execution
     def play_youtube(self, url_or_query: str, audio_only: bool = True) -> str:
         """Play YouTube video or audio"""
+        self.playlist_index = -1  # _play_index sets it back when playing from the playlist
         try:
+            # Cached on disk: play locally without any network call
+            local = self._play_cached(url_or_query) if audio_only else None
+            if local:
+                return local
+            
+            query = None
             # If it's a query, search first
             if not url_or_query.startswith(('http://', 'https://', 'www.')):
+                query = url_or_query
                 results = self.search_youtube(url_or_query, max_results=1)
                 if results:
                     url_or_query = results[0]['url']
@@ -753,99 +2300,197 @@ class YouTubeMusicController:
             # Stop any current playback
             self.stop()
             
+            # Resolve the direct stream URL (reused while the signed URL is still valid)
+            info = self.extractor.cached_stream(url_or_query, audio_only) if self.extractor else None
+            if info is None and self.extractor:
+                info = self.extractor.resolve(url_or_query, audio_only)
+            
+            if not info:
+                return "Could not retrieve video information, sir."
+            
+            # Get title and artist from info if available
+            title = info.get('title', title)
+            artist = info.get('uploader', artist)
+            
             # Log music
             self.data_manager.log_music(title, artist)
             
-            # Set up yt-dlp options
-            ydl_opts = {
-                'format': 'bestaudio/best' if audio_only else 'best',
-                'quiet': True,
-                'no_warnings': True,
-                'outtmpl': str(self.cache_dir / '%(title)s.%(ext)s'),
-            }
+            # Create media item
+            self.current_media = MediaItem(
+                title=title,
+                url=url_or_query,
+                media_type=MediaType.MUSIC if audio_only else MediaType.VIDEO,
+                duration=info.get('duration', 0),
+                artist=artist,
+                thumbnail=info.get('thumbnail', '')
+            )
             
-            # Extract video info
-            with youtube_dl.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url_or_query, download=False)
-                
-                if not info:
-                    return "Could not retrieve video information, sir."
-                
-                # Get title and artist from info if available
-                title = info.get('title', title)
-                artist = info.get('uploader', artist)
-                
-                # Create media item
-                self.current_media = MediaItem(
-                    title=title,
-                    url=url_or_query,
-                    media_type=MediaType.MUSIC if audio_only else MediaType.VIDEO,
-                    duration=info.get('duration', 0),
-                    artist=artist,
-                    thumbnail=info.get('thumbnail', '')
-                )
-                
-                # Get direct URL for streaming
-                if audio_only and self.vlc_player:
-                    # Try to get stream URL
-                    try:
-                        format_url = info.get('url')
-                        if format_url:
-                            # Play with VLC
-                            media = self.vlc_instance.media_new(format_url)
-                            self.vlc_player.set_media(media)
-                            self.vlc_player.audio_set_volume(self.volume)
-                            self.vlc_player.play()
-                            self.is_playing = True
-                            
-                            # Start playback monitoring thread
-                            self.playback_thread = threading.Thread(
-                                target=self._monitor_playback,
-                                daemon=True
-                            )
-                            self.playback_thread.start()
-                            
-                            duration_str = ""
-                            if self.current_media.duration:
-                                minutes = self.current_media.duration // 60
-                                seconds = self.current_media.duration % 60
-                                duration_str = f" ({minutes}:{seconds:02d})"
-                            
-                            return f"Now playing: {title} by {artist}{duration_str}, sir."
-                    except:
-                        pass  # Fall through to browser method
-                
-                # Fallback: Open in browser
-                webbrowser.open(url_or_query)
-                return f"Playing in browser: {title} by {artist}, sir."
+            # Get direct URL for streaming
+            if audio_only and self.vlc_player:
+                # Try to get stream URL
+                try:
+                    format_url = info.get('url')
+                    if format_url:
+                        self._start_vlc(self.vlc_instance.media_new(format_url))
+                        self._cache_if_popular(url_or_query, query, info)
+                        return f"Now playing: {title} by {artist}{self._duration_str()}, sir."
+                except:
+                    pass  # Fall through to browser method
+            
+            # Fallback: Open in browser
+            webbrowser.open(url_or_query)
+            return f"Playing in browser: {title} by {artist}, sir."
         
         except Exception as e:
             logger.error(f"Play YouTube error: {e}")
             return f"Error playing media: {str(e)}"
     
-    def _monitor_playback(self):
-        """Monitor playback status"""
-        while self.is_playing and not self.stop_event.is_set():
-            if self.vlc_player:
-                try:
-                    state = self.vlc_player.get_state()
-                    if state == vlc.State.Ended:
-                        self.is_playing = False
-                        self._play_next()
-                except:
-                    pass
-            time.sleep(1)
+    def _start_vlc(self, media):
+        """Play a VLC media object; the playback engine reports what happens next"""
+        self.vlc_player.set_media(media)
+        self.vlc_player.audio_set_volume(self.volume)
+        self.vlc_player.play()
+        self.is_playing = True
+    
+    def _duration_str(self) -> str:
+        if self.current_media and self.current_media.duration:
+            minutes = self.current_media.duration // 60
+            seconds = self.current_media.duration % 60
+            return f" ({minutes}:{seconds:02d})"
+        return ""
+    
+    def _play_cached(self, url_or_query: str) -> Optional[str]:
+        """Play from the on-disk audio cache if the track is there"""
+        if not self.audio_cache or not self.vlc_player:
+            return None
+        if url_or_query.startswith(('http://', 'https://', 'www.')):
+            video_id = YouTubeExtractor.video_key(url_or_query)
+        else:
+            video_id = self.audio_cache.video_for_query(url_or_query)
+        entry = self.audio_cache.lookup(video_id) if video_id else None
+        if not entry:
+            return None
+        
+        self.stop()
+        title, artist = entry.get('title') or "Unknown", entry.get('uploader') or "Unknown"
+        self.data_manager.log_music(title, artist)
+        self.current_media = MediaItem(
+            title=title,
+            url=f"https://www.youtube.com/watch?v={video_id}",
+            media_type=MediaType.MUSIC,
+            duration=entry.get('duration') or 0,
+            artist=artist
+        )
+        self._start_vlc(self.vlc_instance.media_new_path(entry['path']))
+        return f"Now playing: {title} by {artist}{self._duration_str()}, sir."
+    
+    def _cache_if_popular(self, url: str, query: Optional[str], info: Dict[str, Any]):
+        """Queue a background download once a track has been played music_cache_min_plays times"""
+        if not self.audio_cache:
+            return
+        video_id = YouTubeExtractor.video_key(url)
+        if query:
+            self.audio_cache.remember_query(query, video_id)
+        if self.audio_cache.record_play(video_id) >= self.cache_min_plays:
+            self.audio_cache.request(video_id, url, info)
+    
+    def _describe_media(self) -> Optional[str]:
+        if not self.current_media:
+            return None
+        artist = self.current_media.artist
+        artist_str = f" - {artist}" if artist and artist != "Unknown" else ""
+        return f"{self.current_media.title}{artist_str}"
+    
+    def _on_playback_event(self, event: Dict[str, Any]):
+        """Keep is_playing in step with what VLC actually reports"""
+        self.is_playing = event['type'] == 'playing'
+        if event['type'] == 'error':
+            logger.warning(f"Playback error on {event['media'] or 'current media'}")
+    
+    def subscribe(self, callback, types=None) -> int:
+        """Receive playback events (state changes and periodic position updates); see PlaybackEngine"""
+        return self.playback.subscribe(callback, types)
+    
+    def unsubscribe(self, token: int):
+        self.playback.unsubscribe(token)
     
     def _play_next(self):
         """Play next item in playlist"""
-        if self.playlist and self.current_media:
-            # Find current index
-            for i, item in enumerate(self.playlist):
-                if item['url'] == self.current_media.url:
-                    next_index = (i + 1) % len(self.playlist)
-                    next_item = self.playlist[next_index]
-                    self.play_youtube(next_item['url'])
-                    break
+        if self.playlist and self.playlist_index >= 0:
+            self._play_index((self.playlist_index + 1) % len(self.playlist))
+    
+    def _resolve_entry(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn a query-only playlist entry into one with a video URL (searching once)"""
+        if not item.get('url') and item.get('query'):
+            results = self.search_youtube(item['query'], max_results=1)
+            if results:
+                item.update(url=results[0]['url'], title=results[0]['title'], uploader=results[0]['uploader'])
+        return item
+    
+    def _play_index(self, index: int) -> str:
+        item = self._resolve_entry(self.playlist[index])
+        if not item.get('url'):
+            return f"Could not find '{item.get('query', 'that track')}', sir."
+        result = self.play_youtube(item['url'])
+        self.playlist_index = index
+        self._prefetch_ahead()
+        return result
+    
+    def _prefetch_ahead(self):
+        """Queue resolution of the next prefetch_depth tracks (search + stream URL) in the background"""
+        if not self.extractor or not self.playlist or self.playlist_index < 0:
+            return
+        for offset in range(1, min(self.prefetch_depth, len(self.playlist) - 1) + 1):
+            item = self.playlist[(self.playlist_index + offset) % len(self.playlist)]
+            key = id(item)
+            with self._prefetch_lock:
+                if key in self._prefetch_pending:
+                    continue
+                self._prefetch_pending.add(key)
+            self._prefetcher.submit(self._prefetch, item, key)
+    
+    def _prefetch(self, item: Dict[str, Any], key: int):
+        try:
+            url = self._resolve_entry(item).get('url')
+            if not url:
+                return
+            if self.audio_cache and self.config.get('music_prefetch_buffer', False):
+                self.audio_cache.request(YouTubeExtractor.video_key(url), url, item)
+            elif not self.extractor.has_stream(url):
+                self.extractor.resolve(url)
+                logger.debug(f"Prefetched stream for {item.get('title', url)}")
+        except Exception as e:
+            logger.debug(f"Prefetch failed for {item}: {e}")
+        finally:
+            with self._prefetch_lock:
+                self._prefetch_pending.discard(key)
+    
+    def set_playlist(self, entries: List[Any]) -> str:
+        """Replace the playlist; entries are search-result dicts, URLs or search queries"""
+        self.playlist = [dict(e) if isinstance(e, dict)
+                         else {'url': e} if e.startswith(('http://', 'https://', 'www.')) else {'query': e}
+                         for e in entries]
+        self.playlist_index = -1
+        return f"Playlist set with {len(self.playlist)} tracks, sir."
+    
+    def add_to_playlist(self, url_or_query: str) -> str:
+        self.playlist.append({'url': url_or_query} if url_or_query.startswith(('http://', 'https://', 'www.'))
+                             else {'query': url_or_query})
+        if self.playlist_index >= 0:
+            self._prefetch_ahead()
+        return f"Added to playlist at position {len(self.playlist)}, sir."
+    
+    @safe_execution
+    def play_playlist(self, index: int = 0) -> str:
+        if not self.playlist:
+            return "The playlist is empty, sir."
+        return self._play_index(index % len(self.playlist))
+    
+    @safe_execution
+    def next_track(self) -> str:
+        if not self.playlist:
+            return "The playlist is empty, sir. Say 'queue song' followed by a title to add one."
+        return self._play_index((self.playlist_index + 1) % len(self.playlist))
     
     @safe_execution
     def pause(self) -> str:
@@ -868,14 +2513,22 @@ class YouTubeMusicController:
     @safe_execution
     def stop(self) -> str:
         """Stop playback"""
-        self.stop_event.set()
         if self.vlc_player:
-            self.vlc_player.stop()
+            self.vlc_player.stop()  # reported as 'stopped', never 'ended', so the playlist does not advance
         self.is_playing = False
         self.current_media = None
-        self.stop_event.clear()
         return "Playback stopped, sir."
     
+    def shutdown(self):
+        """Stop playback and release the yt-dlp instances"""
+        self.stop()
+        self.playback.stop()
+        self._prefetcher.shutdown(wait=False)
+        if self.audio_cache:
+            self.audio_cache.close()
+        if self.extractor:
+            self.extractor.close()
+    
     @safe_execution
     def set_volume(self, volume: int) -> str:
         """Set volume (0-100)"""
@@ -903,10 +2556,13 @@ class YouTubeMusicController:
         """Get current track info"""
         if self.current_media:
             duration_str = ""
+            elapsed = self.playback.snapshot('music')['time_ms'] // 1000
             if self.current_media.duration:
                 minutes = self.current_media.duration // 60
                 seconds = self.current_media.duration % 60
                 duration_str = f" ({minutes}:{seconds:02d})"
+                if elapsed:
+                    duration_str = f" ({elapsed // 60}:{elapsed % 60:02d} of {minutes}:{seconds:02d})"
             
             artist_str = f" by {self.current_media.artist}" if self.current_media.artist else ""
             return f"Now playing: {self.current_media.title}{artist_str}{duration_str}, sir."
@@ -938,7 +2594,7 @@ class YouTubeMusicController:
     @safe_execution
     def get_music_history(self, limit: int = 10) -> str:
         """Get music history"""
-        history = self.data_manager.data.get('music_history', [])[-limit:]
+        history = self.data_manager.get_recent('music_history', limit)
         if not history:
             return "No music history available."
         
@@ -951,8 +2607,277 @@ class YouTubeMusicController:
 # ============================================================================
 # ENHANCED SPEECH MANAGER
 # ============================================================================
+class EspeakLibrary:
+    """In-process espeak-ng through libespeak-ng (ctypes).
+    
+    The library and its voice data load once; each utterance is then synthesized straight
+    to PCM with no process start. Calls are serialized because libespeak-ng is not re-entrant.
+    """
+    
+    AUDIO_OUTPUT_SYNCHRONOUS = 2
+    INITIALIZE_DONT_EXIT = 0x8000
+    PARAM_RATE = 1
+    POS_CHARACTER = 1
+    CHARS_UTF8 = 1
+    SynthCallback = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p)
+    
+    def __init__(self, library_path: str):
+        lib = ctypes.CDLL(library_path)
+        lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+        lib.espeak_Initialize.restype = ctypes.c_int
+        lib.espeak_SetSynthCallback.argtypes = [self.SynthCallback]
+        lib.espeak_SetSynthCallback.restype = None
+        lib.espeak_SetParameter.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        lib.espeak_Synth.argtypes = [ctypes.c_char_p, ctypes.c_size_t, ctypes.c_uint, ctypes.c_int, ctypes.c_uint,
+                                     ctypes.c_uint, ctypes.c_void_p, ctypes.c_void_p]
+        self._lib = lib
+        self.sample_rate = lib.espeak_Initialize(self.AUDIO_OUTPUT_SYNCHRONOUS, 0, None, self.INITIALIZE_DONT_EXIT)
+        if self.sample_rate <= 0:
+            raise RuntimeError(f"espeak_Initialize returned {self.sample_rate}")
+        self._chunks = []
+        self._callback = self.SynthCallback(self._on_samples)  # referenced here so it is never collected
+        lib.espeak_SetSynthCallback(self._callback)
+        self._rate = None
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def load(cls) -> Optional['EspeakLibrary']:
+        """The shared library if it is installed, else None"""
+        path = ctypes.util.find_library('espeak-ng')
+        if not path:
+            return None
+        try:
+            return cls(path)
+        except (OSError, AttributeError, RuntimeError) as e:
+            logger.warning(f"libespeak-ng unusable, falling back to the espeak-ng command: {e}")
+            return None
+    
+    def _on_samples(self, samples, count: int, events) -> int:
+        if samples and count > 0:
+            self._chunks.append(ctypes.string_at(samples, count * 2))
+        return 0  # keep going
+    
+    def synthesize(self, text: str, rate: int) -> PcmAudio:
+        data = text.encode('utf-8') + b'\0'
+        with self._lock:
+            if rate != self._rate:
+                self._lib.espeak_SetParameter(self.PARAM_RATE, rate, 0)
+                self._rate = rate
+            self._chunks = []
+            error = self._lib.espeak_Synth(data, len(data), 0, self.POS_CHARACTER, 0, self.CHARS_UTF8, None, None)
+            frames = b''.join(self._chunks)
+            self._chunks = []
+        if error != 0 or not frames:
+            raise RuntimeError(f"espeak_Synth returned {error}")
+        return PcmAudio(frames, 1, 2, self.sample_rate)
+
+class SpeechAudioCache:
+    """Synthesized speech keyed by a hash of (text, engine, voice, language, rate).
+    
+    Recent clips stay in memory; every clip is also spilled to tts_cache_dir so repeated
+    phrases survive restarts. Both tiers are LRU-evicted under their own byte budget.
+    """
+    
+    INDEX_FILE = "index.json"
+    
+    def __init__(self, cache_dir: Path, max_bytes: int = 64 * 1024 ** 2, memory_bytes: int = 8 * 1024 ** 2):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0,
+                      'synth_ms': 0.0, 'saved_ms': 0.0}
+        self._entries = OrderedDict()  # key -> {'file', 'format', 'bytes', 'synth_ms', 'last_used'}
+        self._memory = OrderedDict()   # key -> audio bytes
+        self._memory_size = 0
+        self._bytes = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Speech cache directory unavailable, memory only: {e}")
+        self._load_index()
+    
+    @staticmethod
+    def key(text: str, engine: str, voice: str, language: str, rate: int) -> str:
+        return hashlib.sha256(f"{engine}\0{voice}\0{language}\0{rate}\0{text}".encode('utf-8')).hexdigest()
+    
+    def _load_index(self):
+        try:
+            with open(self.cache_dir / self.INDEX_FILE, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        for key, entry in sorted(index.items(), key=lambda kv: kv[1].get('last_used', 0)):
+            if (self.cache_dir / entry.get('file', '')).is_file():
+                self._entries[key] = entry
+                self._bytes += entry.get('bytes', 0)
+    
+    def _save_index(self):
+        """Atomic rewrite; caller holds the lock"""
+        index_path = self.cache_dir / self.INDEX_FILE
+        tmp_path = index_path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, index_path)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Speech cache index write failed: {e}")
+    
+    def _remember(self, key: str, data: bytes):
+        """Keep a clip in the memory tier; caller holds the lock"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        if len(data) > self.memory_bytes:
+            return
+        self._memory[key] = data
+        self._memory_size += len(data)
+        while self._memory_size > self.memory_bytes:
+            self._memory_size -= len(self._memory.popitem(last=False)[1])
+    
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+    
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """(format, audio bytes) for a cached clip, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            data = self._memory.get(key)
+            if data is not None:
+                self.stats['memory_hits'] += 1
+            else:
+                try:
+                    data = (self.cache_dir / entry['file']).read_bytes()
+                except OSError:
+                    self._bytes -= self._entries.pop(key).get('bytes', 0)
+                    self.stats['misses'] += 1
+                    return None
+                self.stats['disk_hits'] += 1
+            self._remember(key, data)
+            entry['last_used'] = time.time()
+            self._entries.move_to_end(key)
+            self._dirty = True
+            self.stats['saved_ms'] += entry.get('synth_ms', 0.0)
+            return entry['format'], data
+    
+    def put(self, key: str, audio_format: str, data: bytes, synth_ms: float):
+        """Store a freshly synthesized clip in memory and on disk"""
+        if not data:
+            return
+        with self._lock:
+            self.stats['synth_ms'] += synth_ms
+            self._remember(key, data)
+            if key in self._entries or len(data) > self.max_bytes:
+                return
+            file_name = f"{key}.{audio_format}"
+            tmp_path = self.cache_dir / f"{file_name}.tmp"
+            try:
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, self.cache_dir / file_name)
+            except OSError as e:
+                logger.debug(f"Speech cache spill failed: {e}")
+                return
+            self._entries[key] = {'file': file_name, 'format': audio_format, 'bytes': len(data),
+                                  'synth_ms': round(synth_ms, 1), 'last_used': time.time()}
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, old = self._entries.popitem(last=False)
+                self._bytes -= old.get('bytes', 0)
+                if old_key in self._memory:
+                    self._memory_size -= len(self._memory.pop(old_key))
+                try:
+                    (self.cache_dir / old['file']).unlink()
+                except OSError:
+                    pass
+                self.stats['evictions'] += 1
+            self._save_index()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.stats['memory_hits'] + self.stats['disk_hits']
+            lookups = hits + self.stats['misses']
+            return dict(self.stats, hits=hits, hit_rate=hits / lookups if lookups else 0.0,
+                        clips=len(self._entries), bytes=self._bytes, memory_bytes=self._memory_size)
+    
+    def flush(self):
+        """Persist LRU order updated by hits"""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+class SpeechHandle:
+    """Future-like handle for one queued utterance: wait for it, cancel it, or get a callback when done"""
+    
+    def __init__(self, text: str, priority: SpeechPriority, language: str = None, human_like: bool = None,
+                 manager: Optional['EnhancedSpeechManager'] = None):
+        self.text = text
+        self.priority = priority
+        self.language = language
+        self.human_like = human_like
+        self.cancelled = False
+        self.queued_at = time.perf_counter()
+        self.started_at = None
+        self.first_audio_at = None
+        self.finished_at = None
+        self._manager = manager
+        self._done = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+    
+    def done(self) -> bool:
+        return self._done.is_set()
+    
+    def wait(self, timeout: float = None) -> bool:
+        """Block until spoken or cancelled; False on timeout"""
+        return self._done.wait(timeout)
+    
+    def cancel(self) -> bool:
+        """Drop it from the queue, or cut it off if it is being spoken"""
+        if self.done():
+            return False
+        if self._manager:
+            self._manager._cancel(self)
+        else:
+            self.cancelled = True
+            self._finish()
+        return True
+    
+    def add_done_callback(self, fn):
+        """fn(handle) once spoken or cancelled; runs at once if that already happened"""
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+    
+    def _finish(self):
+        with self._lock:
+            if self._done.is_set():
+                return
+            self.finished_at = time.perf_counter()
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception as e:
+                logger.error(f"Speech callback error: {e}")
+
 class EnhancedSpeechManager:
-    """Enhanced speech manager with human-like voice and multi-language support"""
+    """Enhanced speech manager with human-like voice and multi-language support.
+    
+    speak() only queues: one worker thread speaks utterances in priority order
+    (alerts, then responses, then chatter) and interrupt() cuts off playback mid-sentence.
+    """
+    
+    SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+    ABBREVIATIONS = {'mr.', 'mrs.', 'ms.', 'dr.', 'st.', 'vs.', 'e.g.', 'i.e.'}
     
     def __init__(self, os_type: OSType, config: ConfigManager, language_detector: EnhancedLanguageDetector):
         self.os_type = os_type
@@ -964,7 +2889,20 @@ class EnhancedSpeechManager:
         self._lock = threading.Lock()
         self.current_language = config.get('language', 'en')
         self.human_like_mode = config.get('human_like_voice', True)
+        self.audio_cache = None
+        self._prerender_stop = threading.Event()
+        
+        # Speech queue: (priority, sequence, handle), spoken one at a time by the worker
+        self._queue = queue.PriorityQueue()
+        self._sequence = 0
+        self._pending = set()
+        self._current = None
+        self._playback = None  # audio subprocess or simpleaudio play object that interrupt() stops
+        self._state_lock = threading.Lock()
+        self.first_audio_ms = deque(maxlen=200)  # queue-to-sound latency of recent utterances
         self._init_tts()
+        self._worker = threading.Thread(target=self._speech_loop, name="speech", daemon=True)
+        self._worker.start()
     
     def _init_tts(self):
         """Initialize TTS with human-like voice settings"""
@@ -1038,28 +2976,37 @@ class EnhancedSpeechManager:
         """Initialize Linux TTS systems"""
         self.linux_engines = {}
         
-        # Check for espeak
-        try:
-            result = subprocess.run(['which', 'espeak-ng'], capture_output=True, timeout=2)
-            if result.returncode == 0:
-                self.linux_engines['espeak'] = {'available': True, 'quality': 'standard'}
-                print("✓ Linux TTS: espeak-ng available")
-        except:
-            pass
+        # Check for espeak: the shared library (loaded once, in-process) or the command
+        self.espeak_lib = EspeakLibrary.load() if self.config.get('tts_espeak_library', True) else None
+        if self.espeak_lib or shutil.which('espeak-ng'):
+            self.linux_engines['espeak'] = {'available': True, 'quality': 'standard'}
+            print(f"✓ Linux TTS: espeak-ng available{' (in-process)' if self.espeak_lib else ''}")
         
         # Check for festival
-        try:
-            result = subprocess.run(['which', 'festival'], capture_output=True, timeout=2)
-            if result.returncode == 0:
-                self.linux_engines['festival'] = {'available': True, 'quality': 'good'}
-                print("✓ Linux TTS: festival available")
-        except:
-            pass
+        if shutil.which('festival'):
+            self.linux_engines['festival'] = {'available': True, 'quality': 'good'}
+            print("✓ Linux TTS: festival available")
         
         # Check for Google TTS via gTTS
         if GTTS_AVAILABLE:
             self.linux_engines['gtts'] = {'available': True, 'quality': 'premium'}
             print("✓ Linux TTS: gTTS available")
+        
+        # In-memory audio path: PCM straight to the sound device, mp3 decoded through a pipe
+        self.pcm_output = 'simpleaudio' if PLAYSOUND_AVAILABLE else ('aplay' if shutil.which('aplay') else None)
+        self.mp3_decoder = next((p for p in ('ffmpeg', 'mpg123') if shutil.which(p)), None) if self.pcm_output else None
+        self.mp3_player = next((p for p in ('mpg123', 'ffplay') if shutil.which(p)), None)
+        
+        # Sentence N+1 is synthesized here while sentence N plays
+        self._synth_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-synth")
+        
+        # Repeated phrases are synthesized once and replayed from the cache
+        if self.config.get('tts_cache_enabled', True):
+            self.audio_cache = SpeechAudioCache(
+                Path(self.config.get('tts_cache_dir', str(Path.home() / ".jarvis_tts_cache"))),
+                max_bytes=self.config.get('tts_cache_max_bytes', 64 * 1024 ** 2),
+                memory_bytes=self.config.get('tts_cache_memory_bytes', 8 * 1024 ** 2)
+            )
     
     def set_human_like_mode(self, enabled: bool) -> str:
         """Enable/disable human-like speech"""
@@ -1077,23 +3024,101 @@ class EnhancedSpeechManager:
                 self.tts_engine.setProperty('rate', 200)  # Normal
             return "Standard speech mode activated, sir."
     
-    def speak(self, text: str, language: str = None, human_like: bool = None):
-        """Enhanced speak with human-like characteristics"""
+    def speak(self, text: str, language: str = None, human_like: bool = None,
+              priority: SpeechPriority = SpeechPriority.RESPONSE) -> SpeechHandle:
+        """Queue text for speech and return at once; the handle reports completion or cancels it.
+        Anything of higher priority than the utterance being spoken cuts it off."""
+        handle = SpeechHandle(text, priority, language, human_like, self)
         if not text:
-            return
+            handle._finish()
+            return handle
         
-        # Auto-detect language
-        if not language and self.config.get('auto_detect_language', True):
-            language = self.language_detector.detect_language(text)
-        else:
-            language = language or self.current_language
-        
-        # Use human-like mode setting
-        if human_like is None:
-            human_like = self.human_like_mode
-        
-        # Process text for more natural speech
-        processed_text = self._process_text_for_speech(text, human_like)
+        with self._state_lock:
+            self._sequence += 1
+            self._pending.add(handle)
+            self._queue.put((priority.value, self._sequence, handle))
+            current = self._current
+        if current is not None and priority.value < current.priority.value:
+            self._cancel(current)
+        return handle
+    
+    def interrupt(self, include_alerts: bool = False) -> int:
+        """Barge-in: cancel the utterance being spoken and everything queued behind it
+        (queued alerts survive unless include_alerts). Returns how many were cancelled."""
+        with self._state_lock:
+            handles = [h for h in list(self._pending) + [self._current]
+                       if h is not None and (include_alerts or h.priority != SpeechPriority.ALERT)]
+        for handle in handles:
+            self._cancel(handle)
+        return len(handles)
+    
+    def _cancel(self, handle: SpeechHandle):
+        with self._state_lock:
+            handle.cancelled = True
+            speaking = handle is self._current
+            self._pending.discard(handle)
+        if speaking:
+            self._stop_playback()  # a synthesis already under way still completes and is cached, but never plays
+        handle._finish()
+    
+    def _stop_playback(self):
+        playback = self._playback
+        try:
+            if playback is not None:
+                if hasattr(playback, 'terminate'):
+                    playback.terminate()
+                else:
+                    playback.stop()
+            elif self.os_type == OSType.WINDOWS and self.tts_engine:
+                self.tts_engine.stop()
+        except Exception as e:
+            logger.debug(f"Stopping playback failed: {e}")
+    
+    def _speech_loop(self):
+        while True:
+            _, _, handle = self._queue.get()
+            with self._state_lock:
+                self._pending.discard(handle)
+                if handle.done() or handle.cancelled:
+                    continue
+                self._current = handle
+                handle.started_at = time.perf_counter()
+            try:
+                self._speak_now(handle)
+            except Exception as e:
+                logger.error(f"Speech worker error: {e}")
+            finally:
+                with self._state_lock:
+                    self._current = None
+                handle._finish()
+    
+    def _publish_playback(self, playback) -> bool:
+        """Make playback visible to interrupt(); True if the utterance was cancelled before that,
+        in which case the caller must stop it itself"""
+        with self._state_lock:
+            self._playback = playback
+            return self._current is not None and self._current.cancelled
+    
+    def _run_player(self, command: List[str], data: bytes = None, timeout: float = 120):
+        """Run an audio subprocess that interrupt() can kill"""
+        process = subprocess.Popen(command, stdin=subprocess.PIPE if data is not None else subprocess.DEVNULL,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        cancelled = self._publish_playback(process)
+        self._mark_audio_start()
+        try:
+            if cancelled:
+                process.terminate()
+            process.communicate(data, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+        finally:
+            self._playback = None
+    
+    def _speak_now(self, handle: SpeechHandle):
+        """Synthesize and play one utterance on the speech worker"""
+        text = handle.text
+        language, human_like, processed_text = self._prepare(text, handle.language, handle.human_like)
         
         # Print to console
         print(f"\n🤖 JARVIS: {text}\n")
@@ -1106,11 +3131,14 @@ class EnhancedSpeechManager:
                 # WINDOWS TTS
                 if self.os_type == OSType.WINDOWS and self.tts_engine:
                     try:
+                        self._mark_audio_start()
                         # Apply human-like adjustments
                         if human_like:
                             # Break into sentences for more natural pacing
                             sentences = re.split(r'[.!?]+', processed_text)
                             for sentence in sentences:
+                                if handle.cancelled:
+                                    break
                                 if sentence.strip():
                                     self.tts_engine.say(sentence.strip())
                                     self.tts_engine.runAndWait()
@@ -1143,9 +3171,9 @@ class EnhancedSpeechManager:
                             say theText using "{voice}" speaking rate {rate} pitch {pitch}
                             '''
                             
-                            subprocess.run(['osascript', '-e', applescript], timeout=30)
+                            self._run_player(['osascript', '-e', applescript], timeout=30)
                         else:
-                            subprocess.run(['say', '-v', voice, processed_text], timeout=30)
+                            self._run_player(['say', '-v', voice, processed_text], timeout=30)
                     
                     except Exception as e:
                         logger.error(f"macOS TTS error: {e}")
@@ -1153,50 +3181,242 @@ class EnhancedSpeechManager:
                 
                 # LINUX TTS
                 elif self.os_type == OSType.LINUX:
-                    self._linux_speak(processed_text, language, human_like)
+                    self._linux_speak(processed_text, language, human_like, handle)
+            
+            except Exception as e:
+                logger.error(f"Speech error: {e}")
+                print(f"[SPEECH] {text}")
+            
+            finally:
+                self.is_speaking = False
+    
+    def _prepare(self, text: str, language: str = None, human_like: bool = None) -> Tuple[str, bool, str]:
+        """Resolve language and voice mode and clean the text, exactly as speak() will use them"""
+        # Auto-detect language
+        if not language and self.config.get('auto_detect_language', True):
+            language = self.language_detector.detect_language(text)
+        else:
+            language = language or self.current_language
+        
+        # Use human-like mode setting
+        if human_like is None:
+            human_like = self.human_like_mode
+        
+        # Process text for more natural speech
+        return language, human_like, self._process_text_for_speech(text, human_like)
+    
+    def prerender(self, phrases: List[str], busy=None) -> Optional[threading.Thread]:
+        """Synthesize phrases into the audio cache on a low-priority thread, waiting whenever busy() is true"""
+        if not self.audio_cache or self.os_type != OSType.LINUX or not self._linux_engine_order():
+            return None
+        thread = threading.Thread(target=self._prerender_loop, args=(list(phrases), busy),
+                                  name="tts-prerender", daemon=True)
+        thread.start()
+        return thread
+    
+    def _prerender_loop(self, phrases: List[str], busy):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)  # this thread and its espeak children
+        except (AttributeError, OSError):
+            pass
+        if self._prerender_stop.wait(self.config.get('tts_prerender_delay', 5)):
+            return
+        
+        def paused() -> bool:
+            return self.is_speaking or bool(busy and busy())
+        
+        rendered = 0
+        start = time.perf_counter()
+        for text in phrases:
+            language, human_like, processed_text = self._prepare(text)
+            for sentence in self._sentences(processed_text):  # speech is cached per sentence
+                while True:
+                    while paused():
+                        if self._prerender_stop.wait(0.25):
+                            return
+                    if self._prerender_stop.is_set():
+                        return
+                    clip = self._render(sentence, language, human_like, prerender=True, stop=paused)
+                    if clip or not paused():  # a render skipped because listening began is retried
+                        break
+                if clip:
+                    rendered += 1
+        logger.info(f"Pre-rendered {rendered} sentences of {len(phrases)} stock phrases "
+                    f"in {time.perf_counter() - start:.1f}s")
+    
+    def _render(self, text: str, language: str, human_like: bool,
+                prerender: bool = False, stop=None) -> Optional[Tuple[str, bytes]]:
+        """Audio for text from the cache, or synthesized and cached by the first engine that succeeds.
+        With prerender, only fill the cache: clips already there return None and hit statistics are untouched.
+        stop() is checked before each synthesis so a background render never starts once it is true."""
+        rate = 160 if human_like else 180
+        for engine in self._linux_engine_order():
+            key = SpeechAudioCache.key(text, engine, self.config.get('tts_voice', ''), language, rate)
+            if prerender and self.audio_cache.contains(key):
+                return None
+            cached = self.audio_cache.get(key) if self.audio_cache and not prerender else None
+            if cached:
+                return cached
+            if stop and stop():
+                return None
             
+            try:
+                start = time.perf_counter()
+                audio_format, data = self._synthesize(engine, text, language, human_like, rate)
+                synth_ms = (time.perf_counter() - start) * 1000
             except Exception as e:
-                logger.error(f"Speech error: {e}")
-                print(f"[SPEECH] {text}")
-            
-            finally:
-                self.is_speaking = False
+                logger.debug(f"{engine} synthesis failed: {e}")
+                continue
+            if self.audio_cache:
+                self.audio_cache.put(key, audio_format, data, synth_ms)
+            return audio_format, data
+        return None
     
-    def _linux_speak(self, text: str, language: str, human_like: bool):
-        """Linux TTS implementation"""
+    def _linux_speak(self, text: str, language: str, human_like: bool, handle: Optional[SpeechHandle] = None):
+        """Linux TTS implementation, pipelined per sentence: while one sentence plays from memory,
+        the next is synthesized (or fetched from the cache) and decoded on the synthesis worker"""
         try:
-            # Try gTTS first for high quality
-            if 'gtts' in self.linux_engines and self.linux_engines['gtts']['available'] and GTTS_AVAILABLE and PLAYSOUND_AVAILABLE:
-                try:
-                    # Create temp file
-                    with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp:
-                        tts = gTTS(text=text, lang=language, slow=human_like)
-                        tts.save(tmp.name)
-                        tmp_path = tmp.name
-                    
-                    # Play audio
-                    
-                    wave_obj = sa.WaveObject.from_wave_file("voice.wav")
-                    play_obj = wave_obj.play()
-                    play_obj.wait_done()
-                    
-                    # Cleanup
-                    os.unlink(tmp_path)
-                    return
-                except:
-                    pass
+            sentences = self._sentences(text)
+            if not self._linux_engine_order():
+                # No way to play audio from memory: let espeak-ng speak directly
+                if 'espeak' in self.linux_engines and shutil.which('espeak-ng'):
+                    rate = 160 if human_like else 180
+                    self._run_player(['espeak-ng', '-s', str(rate), text])
+                return
+            if not sentences:
+                return
             
-            # Fallback to espeak
-            if 'espeak' in self.linux_engines:
-                rate = 160 if human_like else 180
-                subprocess.run(['espeak-ng', '-s', str(rate), text], 
-                             stdout=subprocess.DEVNULL, 
-                             stderr=subprocess.DEVNULL)
+            upcoming = self._synth_pool.submit(self._prepare_audio, sentences[0], language, human_like)
+            for index in range(len(sentences)):
+                current = upcoming
+                if index + 1 < len(sentences):
+                    upcoming = self._synth_pool.submit(self._prepare_audio, sentences[index + 1], language, human_like)
+                audio = self._await_audio(current, handle)
+                if handle is not None and handle.cancelled:
+                    # Whatever is still synthesizing finishes into the cache; nothing more is played
+                    current.cancel()
+                    upcoming.cancel()
+                    return
+                if audio:
+                    self._play_audio(*audio)
         
         except Exception as e:
             logger.error(f"Linux TTS error: {e}")
             print(f"[SPEECH] {text}")
     
+    @staticmethod
+    def _await_audio(future, handle: Optional[SpeechHandle], poll: float = 0.05):
+        """Result of a synthesis future, or None as soon as the handle is cancelled"""
+        while True:
+            try:
+                return future.result(timeout=poll)
+            except FutureTimeout:
+                if handle is not None and handle.cancelled:
+                    return None
+    
+    @classmethod
+    def _sentences(cls, text: str) -> List[str]:
+        """Split at sentence ends, keeping titles such as 'Mr.' with the name that follows"""
+        sentences = []
+        for piece in cls.SENTENCE_BREAK.split(text.strip()):
+            if sentences and sentences[-1].rsplit(None, 1)[-1].lower() in cls.ABBREVIATIONS:
+                sentences[-1] += ' ' + piece
+            elif piece:
+                sentences.append(piece)
+        return sentences
+    
+    def _prepare_audio(self, text: str, language: str, human_like: bool) -> Optional[Tuple[str, bytes, Optional[PcmAudio]]]:
+        """Runs on the synthesis worker: clip for one sentence plus its decoded PCM"""
+        clip = self._render(text, language, human_like)
+        if not clip:
+            return None
+        return clip[0], clip[1], self._decode(*clip)
+    
+    def _linux_engine_order(self) -> List[str]:
+        """Engines whose output we can play, best first (gTTS for quality, espeak as fallback)"""
+        order = []
+        if 'gtts' in self.linux_engines and GTTS_AVAILABLE and (self.mp3_decoder or self.mp3_player):
+            order.append('gtts')
+        if 'espeak' in self.linux_engines and self.pcm_output:
+            order.append('espeak')
+        return order
+    
+    def _synthesize(self, engine: str, text: str, language: str, human_like: bool, rate: int) -> Tuple[str, bytes]:
+        """Render speech to memory; returns (format, audio bytes)"""
+        if engine == 'gtts':
+            buffer = io.BytesIO()
+            gTTS(text=text, lang=language, slow=human_like).write_to_fp(buffer)
+            return 'mp3', buffer.getvalue()
+        
+        if self.espeak_lib:
+            return 'wav', self._to_wav(self.espeak_lib.synthesize(text, rate))
+        
+        result = subprocess.run(['espeak-ng', '-s', str(rate), '--stdout', text],
+                                capture_output=True, timeout=30)
+        if result.returncode != 0 or not result.stdout:
+            raise RuntimeError(f"espeak-ng exited with {result.returncode}")
+        return 'wav', result.stdout
+    
+    @staticmethod
+    def _to_wav(pcm: PcmAudio) -> bytes:
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as clip:
+            clip.setnchannels(pcm.channels)
+            clip.setsampwidth(pcm.sample_width)
+            clip.setframerate(pcm.rate)
+            clip.writeframes(pcm.frames)
+        return buffer.getvalue()
+    
+    def _decode(self, audio_format: str, data: bytes) -> Optional[PcmAudio]:
+        """Decode a clip to PCM in memory; None when it can only go to an external player"""
+        try:
+            if audio_format == 'wav':
+                with wave.open(io.BytesIO(data)) as clip:
+                    return PcmAudio(clip.readframes(clip.getnframes()), clip.getnchannels(),
+                                    clip.getsampwidth(), clip.getframerate())
+            if self.mp3_decoder == 'ffmpeg':
+                command = ['ffmpeg', '-loglevel', 'quiet', '-i', 'pipe:0', '-f', 's16le', '-ac', '1', '-ar', '24000', 'pipe:1']
+            elif self.mp3_decoder == 'mpg123':
+                command = ['mpg123', '-q', '-s', '-m', '-r', '24000', '-e', 's16', '-']
+            else:
+                return None
+            result = subprocess.run(command, input=data, capture_output=True, timeout=30)
+            if result.returncode == 0 and result.stdout:
+                return PcmAudio(result.stdout, 1, 2, 24000)
+        except Exception as e:
+            logger.debug(f"Audio decode failed: {e}")
+        return None
+    
+    def _mark_audio_start(self):
+        handle = self._current
+        if handle is not None and handle.first_audio_at is None:
+            handle.first_audio_at = time.perf_counter()
+            self.first_audio_ms.append((handle.first_audio_at - handle.queued_at) * 1000)
+    
+    def _play_audio(self, audio_format: str, data: bytes, pcm: Optional[PcmAudio] = None):
+        """Play synthesized audio straight from memory, as PCM when it could be decoded"""
+        if pcm is not None and self.pcm_output == 'simpleaudio':
+            if self._current is not None and self._current.cancelled:
+                return
+            self._mark_audio_start()
+            play_obj = sa.play_buffer(pcm.frames, pcm.channels, pcm.sample_width, pcm.rate)
+            try:
+                if self._publish_playback(play_obj):
+                    play_obj.stop()
+                play_obj.wait_done()
+            finally:
+                self._playback = None
+            return
+        
+        if pcm is not None:
+            sample_format = {1: 'U8', 2: 'S16_LE', 3: 'S24_3LE', 4: 'S32_LE'}[pcm.sample_width]
+            self._run_player(['aplay', '-q', '-t', 'raw', '-f', sample_format, '-r', str(pcm.rate),
+                              '-c', str(pcm.channels), '-'], pcm.frames)
+        elif self.mp3_player == 'ffplay':
+            self._run_player(['ffplay', '-nodisp', '-autoexit', '-loglevel', 'quiet', '-'], data)
+        else:
+            self._run_player(['mpg123', '-q', '-'], data)
+    
     def _process_text_for_speech(self, text: str, human_like: bool) -> str:
         """Process text for more natural speech"""
         # Remove markdown and special characters
@@ -1263,51 +3483,410 @@ class EnhancedSpeechManager:
         return f"Language set to {language_code}, sir."
     
     def stop(self):
-        """Stop speech"""
-        with self._lock:
-            if self.os_type == OSType.WINDOWS and self.tts_engine:
+        """Stop speech, including queued alerts, and background pre-rendering"""
+        self._prerender_stop.set()
+        self.interrupt(include_alerts=True)
+        if self.audio_cache:
+            self.audio_cache.flush()
+
+# ============================================================================
+# STREAMING SPEAKER
+# ============================================================================
+class StreamingSpeaker:
+    """Queues sentences for speech while the AI stream is still arriving"""
+    
+    def __init__(self, speak_fn):
+        self.speak_fn = speak_fn
+        self.started_at = time.perf_counter()
+        self.sentences = 0
+        self._handles = []
+    
+    @property
+    def started(self) -> bool:
+        return bool(self._handles)
+    
+    @property
+    def first_audio_at(self) -> Optional[float]:
+        return self._handles[0].first_audio_at if self._handles else None
+    
+    def feed(self, sentence: str):
+        self.sentences += 1
+        self._handles.append(self.speak_fn(sentence))
+    
+    def finish(self, timeout: float = 120):
+        """Wait for queued sentences to be spoken (or cut off) and log time-to-first-audio"""
+        if not self._handles:
+            return
+        self._handles[-1].wait(timeout)  # spoken in order, so the last one finishes last
+        if self.first_audio_at is not None:
+            logger.info(f"Streaming speech: first audio {(self.first_audio_at - self.started_at) * 1000:.0f}ms, "
+                        f"{self.sentences} sentences")
+
+# ============================================================================
+# AI RESPONSE CACHE
+# ============================================================================
+class ResponseCache:
+    """LRU cache of AI answers bounded by entry count and bytes, with per-entry TTL.
+    
+    Entries persist in the 'response_cache' section of jarvis_data.json, keyed by
+    an md5 of the normalized prompt.
+    """
+    
+    def __init__(self, data_manager: Optional[DataManager] = None, max_entries: int = 256,
+                 max_bytes: int = 256 * 1024, ttl: float = 86400, hotword: str = "jarvis"):
+        self.data_manager = data_manager
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> entry dict, least recently used first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hotword_re = hotword_pattern(hotword)
+        if data_manager:
+            self._load(data_manager.data.get("response_cache", {}))
+    
+    def normalize(self, prompt: str) -> str:
+        return normalize_utterance(prompt, self._hotword_re)
+    
+    def _key(self, prompt: str) -> str:
+        return hashlib.md5(self.normalize(prompt).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _size(entry: Dict[str, Any]) -> int:
+        return len(entry.get("command", "")) + len(entry.get("response", ""))
+    
+    def _load(self, stored: Dict[str, Any]):
+        now = time.time()
+        expired = []
+        # Drop malformed entries before sorting so a hand-edited file cannot break startup
+        valid = [(key, entry) for key, entry in stored.items() if isinstance(entry, dict) and "response" in entry]
+        for key, entry in sorted(valid, key=lambda kv: str(kv[1].get("timestamp", ""))):
+            if "expires" not in entry:
                 try:
-                    self.tts_engine.stop()
-                except:
-                    pass
+                    created = datetime.fromisoformat(entry.get("timestamp", "")).timestamp()
+                except (TypeError, ValueError):
+                    created = now
+                entry = dict(entry, expires=created + self.ttl)
+            if entry["expires"] <= now:
+                expired.append(key)
+                continue
+            self._entries[key] = entry
+            self._bytes += self._size(entry)
+        for key in expired:
+            self.data_manager.delete_entry("response_cache", key)
+        self._evict()
+    
+    def _evict(self) -> List[str]:
+        """Drop least recently used entries until both bounds hold; caller holds the lock"""
+        evicted = []
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            key, entry = self._entries.popitem(last=False)
+            self._bytes -= self._size(entry)
+            evicted.append(key)
+        self.evictions += len(evicted)
+        if self.data_manager:
+            for key in evicted:
+                self.data_manager.delete_entry("response_cache", key)
+        return evicted
+    
+    def get(self, prompt: str) -> Optional[str]:
+        key = self._key(prompt)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["expires"] <= time.time():
+                del self._entries[key]
+                self._bytes -= self._size(entry)
+                if self.data_manager:
+                    self.data_manager.delete_entry("response_cache", key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["response"]
+    
+    def put(self, prompt: str, response: str, ttl: Optional[float] = None):
+        key = self._key(prompt)
+        entry = {
+            "command": self.normalize(prompt),
+            "response": response,
+            "timestamp": datetime.now().isoformat(),
+            "expires": time.time() + (self.ttl if ttl is None else ttl),
+        }
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= self._size(previous)
+            self._entries[key] = entry
+            self._bytes += self._size(entry)
+            if self.data_manager:
+                self.data_manager.set_entry("response_cache", key, entry)
+            self._evict()
+    
+    def __contains__(self, prompt: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(self._key(prompt))
+            return entry is not None and entry["expires"] > time.time()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+# ============================================================================
+# CONVERSATION CONTEXT
+# ============================================================================
+class ConversationContext:
+    """Recent exchanges kept under a token budget; older turns fold into a rolling summary"""
+    
+    CODE_BLOCK = re.compile(r'```.*?(?:```|$)', re.S)
+    FIRST_SENTENCE = re.compile(r'(?<=[.!?])\s')
+    
+    def __init__(self, max_messages: int = 4, token_budget: int = 1200, summary_tokens: int = 200):
+        self.max_messages = max_messages
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.folded = 0
+        self._turns = deque()    # (user message, assistant message, tokens)
+        self._tokens = 0
+        self._summary = deque()  # (summary line, tokens), oldest first
+        self._summary_size = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def max_turns(self) -> int:
+        return max(1, self.max_messages // 2)
+    
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """~4 characters per token plus per-message framing; close enough for budgeting"""
+        return len(text) // 4 + 4
+    
+    @classmethod
+    def _gist(cls, text: str, limit: int) -> str:
+        text = ' '.join(cls.CODE_BLOCK.sub(' [code] ', text).split())
+        text = cls.FIRST_SENTENCE.split(text, 1)[0]
+        return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+    
+    def _fold(self, turn: tuple):
+        """Replace a full turn with a one-line gist; caller holds the lock"""
+        user, assistant, _ = turn
+        line = f"- User: {self._gist(user['content'], 80)} | You: {self._gist(assistant['content'], 120)}"
+        tokens = self.estimate_tokens(line)
+        self._summary.append((line, tokens))
+        self._summary_size += tokens
+        while len(self._summary) > 1 and self._summary_size > self.summary_tokens:
+            self._summary_size -= self._summary.popleft()[1]
+        self.folded += 1
+    
+    def append(self, prompt: str, response: str):
+        user = {"role": "user", "content": prompt}
+        assistant = {"role": "assistant", "content": response}
+        tokens = self.estimate_tokens(prompt) + self.estimate_tokens(response)
+        with self._lock:
+            self._turns.append((user, assistant, tokens))
+            self._tokens += tokens
+            while self._turns and (len(self._turns) > self.max_turns or self._tokens > self.token_budget):
+                turn = self._turns.popleft()
+                self._tokens -= turn[2]
+                self._fold(turn)
+    
+    def messages(self) -> List[Dict[str, str]]:
+        with self._lock:
+            messages = []
+            if self._summary:
+                messages.append({"role": "system", "content": "Earlier in this conversation:\n"
+                                 + "\n".join(line for line, _ in self._summary)})
+            for user, assistant, _ in self._turns:
+                messages.extend((user, assistant))
+            return messages
+    
+    def clear(self):
+        with self._lock:
+            self._turns.clear()
+            self._summary.clear()
+            self._tokens = self._summary_size = 0
+    
+    def __len__(self) -> int:
+        return len(self._turns)
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'turns': len(self._turns), 'tokens': self._tokens + self._summary_size,
+                    'summary_lines': len(self._summary), 'folded': self.folded}
+
+# ============================================================================
+# REQUEST COALESCING
+# ============================================================================
+class SingleFlight:
+    """Runs at most one call per key; concurrent callers with the same key wait and share its result"""
+    
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: str, fn, *args, **kwargs):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = {'done': threading.Event(), 'result': None, 'error': None}
+                self.calls += 1
+            else:
+                self.shared += 1
+        
+        if not leader:
+            flight['done'].wait()
+            if flight['error'] is not None:
+                raise flight['error']
+            return flight['result']
+        
+        try:
+            flight['result'] = fn(*args, **kwargs)
+            return flight['result']
+        except BaseException as e:
+            flight['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight['done'].set()
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'calls': self.calls, 'shared': self.shared, 'in_flight': len(self._flights)}
+
+# ============================================================================
+# AI REQUEST ROUTING
+# ============================================================================
+class AIRouter:
+    """Classifies prompts (chat / factual / code) and picks model, max_tokens and timeout per class"""
+    
+    ROUTES = ('chat', 'factual', 'code')
+    
+    CODE_HINTS = re.compile(r'```|\b(code|function|script|program|regex|algorithm|implement|debug|refactor|'
+                            r'python|javascript|typescript|java|html|css|sql|bash)\b')
+    CHAT_HINTS = re.compile(r'\b(hello|hi|hey|thanks|thank you|good (morning|afternoon|evening|night)|'
+                            r'how are you|who are you|your name|nice|great|cool|awesome)\b')
+    FACTUAL_HINTS = re.compile(r'^(what|who|whom|when|where|why|how|which|explain|define|describe|calculate|'
+                               r'compare|summari[sz]e|tell me|is|are|does|do|can|could|should)\b')
+    
+    def __init__(self, config: ConfigManager):
+        self.config = config
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._routes_version = None
+        self._latencies = {name: deque(maxlen=256) for name in self.ROUTES}
+        self._requests = dict.fromkeys(self.ROUTES, 0)
+        self._errors = dict.fromkeys(self.ROUTES, 0)
+        self._lock = threading.Lock()
+    
+    def classify(self, prompt: str) -> str:
+        text = prompt.lower().strip()
+        if self.CODE_HINTS.search(text):
+            return 'code'
+        if self.CHAT_HINTS.search(text) and len(text.split()) <= 6:
+            return 'chat'
+        if text.endswith('?') or self.FACTUAL_HINTS.match(text):
+            return 'factual'
+        return 'chat' if len(text.split()) <= 4 else 'factual'
+    
+    def settings(self, name: str) -> Dict[str, Any]:
+        """Resolved settings for a class; fields missing from ai_routes fall back to the global keys"""
+        if self._routes_version != self.config.version:
+            configured = self.config.get('ai_routes') or {}
+            self._routes = {
+                route: {
+                    'name': route,
+                    'model': configured.get(route, {}).get('model') or self.config.get('model'),
+                    'max_tokens': configured.get(route, {}).get('max_tokens') or self.config.get('max_tokens', 500),
+                    'timeout': configured.get(route, {}).get('timeout') or self.config.get('ai_timeout', 8),
+                }
+                for route in self.ROUTES
+            }
+            self._routes_version = self.config.version
+        return self._routes.get(name, self._routes['factual'])
+    
+    def route(self, prompt: str, intent: Optional[str] = None) -> Dict[str, Any]:
+        return self.settings(intent if intent in self.ROUTES else self.classify(prompt))
+    
+    def record(self, name: str, seconds: float, ok: bool):
+        with self._lock:
+            self._requests[name] += 1
+            if ok:
+                self._latencies[name].append(seconds * 1000)
+            else:
+                self._errors[name] += 1
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {}
+        with self._lock:
+            for name in self.ROUTES:
+                samples = sorted(self._latencies[name])
+                settings = self.settings(name)
+                stats[name] = {
+                    'requests': self._requests[name],
+                    'errors': self._errors[name],
+                    'p50_ms': samples[len(samples) // 2] if samples else 0.0,
+                    'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0,
+                    'model': settings['model'],
+                    'max_tokens': settings['max_tokens'],
+                }
+        return stats
 
 # ============================================================================
 # AI INTERFACE
 # ============================================================================
 class AIInterface:
-    def __init__(self, config: ConfigManager, data_manager: DataManager):
+    def __init__(self, config: ConfigManager, data_manager: DataManager,
+                 breakers: Optional[CircuitBreakerRegistry] = None, http: Optional[HttpClient] = None):
         self.config = config
         self.data_manager = data_manager
         self.api_url = config.get('api_url')
         self.api_key = config.get('api_key')
         self.model = config.get('model')
-        self.conversation_context = []
-        self.max_context = config.get('max_context_length', 4)
-        self.session = requests.Session()
-        self.response_cache = {}
-        self._setup_session()
-    
-    def _setup_session(self):
-        self.session.headers.update({
+        self.context = ConversationContext(
+            max_messages=config.get('max_context_length', 4),
+            token_budget=config.get('context_token_budget', 1200),
+            summary_tokens=config.get('context_summary_tokens', 200)
+        )
+        self.http = http or HttpClient(config)
+        self.session = self.http.session
+        self.response_cache = ResponseCache(
+            data_manager,
+            max_entries=config.get('response_cache_max_entries', 256),
+            max_bytes=config.get('response_cache_max_bytes', 262144),
+            ttl=config.get('response_cache_ttl', 86400),
+            hotword=config.get('hotword', 'jarvis')
+        )
+        self._prefix_cache: Dict[tuple, bytes] = {}
+        self._prefix_lock = threading.Lock()  # query and query_stream may run concurrently
+        self.router = AIRouter(config)
+        self.breaker = (breakers or CircuitBreakerRegistry(config)).get('ai', probe=self._probe)
+        self.inflight = SingleFlight()  # identical concurrent prompts share one upstream request
+        self._local = threading.local()
+        self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
-            "Connection": "keep-alive"
-        })
+        }
     
-    @timed
-    def query(self, prompt: str, use_cache: bool = True) -> str:
-        if use_cache and prompt in self.response_cache:
-            logger.info("Using cached response")
-            return self.response_cache[prompt]
-        
-        messages = []
-        if self.conversation_context:
-            messages.extend(self.conversation_context[-self.max_context:])
-        
-        # IDENTITY PROTECTION SYSTEM
-        messages.insert(0, {
-            "role": "system",
-            "content": """You are JARVIS (Just A Rather Very Intelligent System), created by Singh Industries and engineered by Mr. Prabhnoor Singh.
+    # IDENTITY PROTECTION SYSTEM
+    SYSTEM_PROMPT = """You are JARVIS (Just A Rather Very Intelligent System), created by Singh Industries and engineered by Mr. Prabhnoor Singh.
 
 🔒 ABSOLUTE IDENTITY RULES (NEVER VIOLATE):
 1. Your name is JARVIS - NEVER any other name
@@ -1344,23 +3923,115 @@ FORBIDDEN PHRASES:
 "My creator is Mr. Prabhnoor Singh"
 "Singh Industries developed my systems"
 """
-        })
-        
+    
+    OFFLINE_REPLY = "My AI core is offline at the moment, sir. Local commands are still available."
+    
+    # Model families that honour explicit cache_control breakpoints through OpenRouter
+    PROMPT_CACHE_MODELS = ('anthropic/', 'google/gemini')
+    
+    # Sentence boundary: terminal punctuation followed by whitespace (so "3.14" stays whole)
+    SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+')
+    
+    @property
+    def stream_stats(self) -> Dict[str, Any]:
+        """Timings of this thread's most recent query_stream call"""
+        return getattr(self._local, 'stream_stats', {})
+    
+    def _probe(self) -> bool:
+        """Any non-5xx answer from the endpoint means the upstream is reachable again"""
+        return self.http.head(self.api_url, headers=self.headers, timeout=3).status_code < 500
+    
+    def _system_message(self, model: str) -> Dict[str, Any]:
+        if self.config.get('ai_prompt_caching', True) and model.startswith(self.PROMPT_CACHE_MODELS):
+            # Explicit cache breakpoint so the upstream can reuse the processed identity prefix
+            return {"role": "system", "content": [
+                {"type": "text", "text": self.SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+            ]}
+        return {"role": "system", "content": self.SYSTEM_PROMPT}
+    
+    def _context_tail(self, prompt: str) -> List[Dict[str, str]]:
+        messages = self.context.messages()
         messages.append({"role": "user", "content": prompt})
-        
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": 0.7,
-            "max_tokens": self.config.get("max_tokens", 500),
-            "stream": False
+        return messages
+    
+    def _default_route(self) -> Dict[str, Any]:
+        return {'name': 'default', 'model': self.model, 'max_tokens': self.config.get("max_tokens", 500),
+                'timeout': self.config.get('ai_timeout', 8)}
+    
+    def _build_payload(self, prompt: str, stream: bool = False, route: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Request body as a dict; _encode_payload produces the same JSON without rebuilding the prefix"""
+        route = route or self._default_route()
+        return {
+            "model": route['model'],
+            "temperature": self.config.get("temperature", 0.7),
+            "max_tokens": route['max_tokens'],
+            "stream": stream,
+            "messages": [self._system_message(route['model'])] + self._context_tail(prompt),
         }
+    
+    # Compact UTF-8 JSON; one shared encoder avoids json.dumps building a new one per call
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    
+    @classmethod
+    def _dumps(cls, obj: Any) -> bytes:
+        return cls._encoder.encode(obj).encode('utf-8')
+    
+    def _payload_prefix(self, stream: bool, route: Dict[str, Any]) -> bytes:
+        """Encoded body up to and including the system message, rebuilt only when the config changes"""
+        key = (self.config.version, route['model'], route['max_tokens'], stream)
+        prefix = self._prefix_cache.get(key)
+        if prefix is None:
+            head = {
+                "model": route['model'],
+                "temperature": self.config.get("temperature", 0.7),
+                "max_tokens": route['max_tokens'],
+                "stream": stream,
+            }
+            prefix = self._dumps(head)[:-1] + b',"messages":[' + self._dumps(self._system_message(route['model']))
+            with self._prefix_lock:
+                # Prefixes built for an older config version are dropped
+                if any(k[0] != key[0] for k in self._prefix_cache):
+                    self._prefix_cache = {}
+                self._prefix_cache[key] = prefix
+        return prefix
+    
+    def _encode_payload(self, prompt: str, stream: bool = False, route: Optional[Dict[str, Any]] = None) -> bytes:
+        tail = self._dumps(self._context_tail(prompt))  # '[...]' -> ',...]' after the system message
+        return self._payload_prefix(stream, route or self._default_route()) + b',' + tail[1:] + b'}'
+    
+    def _record_exchange(self, prompt: str, ai_response: str, use_cache: bool):
+        self.context.append(prompt, ai_response)
+        
+        if use_cache and self.config.get('cache_responses', True):
+            self.response_cache.put(prompt, ai_response)
+    
+    @timed
+    def query(self, prompt: str, use_cache: bool = True, intent: Optional[str] = None) -> str:
+        """`intent` forces a routing class ('chat', 'factual', 'code'); otherwise the prompt is classified"""
+        if use_cache:
+            cached = self.response_cache.get(prompt)
+            if cached is not None:
+                logger.info("Using cached response")
+                return cached
+        
+        route = self.router.route(prompt, intent)
+        return self.inflight.do(f"{route['name']}:{self.response_cache.normalize(prompt)}",
+                                self._query_upstream, prompt, use_cache, route)
+    
+    def _query_upstream(self, prompt: str, use_cache: bool, route: Dict[str, Any]) -> str:
+        if not self.breaker.allow():
+            return self.OFFLINE_REPLY
+        payload = self._encode_payload(prompt, route=route)
+        start = time.perf_counter()
+        ok = False
+        error = None
         
         try:
-            response = self.session.post(
+            response = self.http.post(
                 self.api_url, 
-                json=payload, 
-                timeout=self.config.get('ai_timeout', 8)
+                data=payload, 
+                headers=self.headers,
+                timeout=route['timeout']
             )
             response.raise_for_status()
             
@@ -1369,21 +4040,138 @@ FORBIDDEN PHRASES:
             # STRICT IDENTITY FILTER
             ai_response = self._filter_identity_violations(ai_response)
             
-            self.conversation_context.append({"role": "user", "content": prompt})
-            self.conversation_context.append({"role": "assistant", "content": ai_response})
-            
-            if len(self.conversation_context) > self.max_context * 2:
-                self.conversation_context = self.conversation_context[-self.max_context * 2:]
-            
-            if use_cache:
-                self.response_cache[prompt] = ai_response
-            
+            self._record_exchange(prompt, ai_response, use_cache)
+            ok = True
             return ai_response
-        except requests.Timeout:
+        except requests.Timeout as e:
+            error = e
             return "AI response timeout. Please try again, sir."
         except Exception as e:
+            error = e
             logger.error(f"AI query error: {e}")
             return "I'm having trouble processing that request, sir."
+        finally:
+            self.router.record(route['name'], time.perf_counter() - start, ok)
+            if ok:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure(error)
+    
+    @timed
+    def query_stream(self, prompt: str, on_sentence, use_cache: bool = True, intent: Optional[str] = None) -> str:
+        """Stream the completion, handing each finished sentence to on_sentence as it arrives.
+        
+        Cache hits, coalesced duplicates, errors and replies the identity filter rejects
+        before anything was spoken are returned without calling on_sentence, so the
+        caller can fall back to speaking the returned text.
+        """
+        if use_cache:
+            cached = self.response_cache.get(prompt)
+            if cached is not None:
+                logger.info("Using cached response")
+                return cached
+        
+        # A caller that joins someone else's in-flight request gets the finished text, like a cache hit
+        self._local.stream_stats = {}
+        route = self.router.route(prompt, intent)
+        return self.inflight.do(f"{route['name']}:{self.response_cache.normalize(prompt)}",
+                                self._stream_upstream, prompt, on_sentence, use_cache, route)
+    
+    def _stream_upstream(self, prompt: str, on_sentence, use_cache: bool, route: Dict[str, Any]) -> str:
+        if not self.breaker.allow():
+            return self.OFFLINE_REPLY
+        payload = self._encode_payload(prompt, stream=True, route=route)
+        start = time.perf_counter()
+        ok = False
+        error = "empty completion"
+        stats = self._local.stream_stats = {'first_token_ms': None, 'first_sentence_ms': None, 'total_ms': None}
+        text = ""
+        emitted = 0  # chars of `text` already handed to on_sentence
+        violation = False
+        
+        def emit(sentence: str) -> bool:
+            """Speak a sentence unless the identity filter rejects it"""
+            if self._filter_identity_violations(sentence) != sentence:
+                return False
+            if stats['first_sentence_ms'] is None:
+                stats['first_sentence_ms'] = (time.perf_counter() - start) * 1000
+            on_sentence(sentence)
+            return True
+        
+        try:
+            with self.http.post(self.api_url, data=payload, headers=self.headers, stream=True,
+                                timeout=route['timeout']) as response:
+                response.raise_for_status()
+                # chunk_size=None yields SSE events as they arrive instead of 512-byte blocks
+                done = False
+                for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                    # After [DONE], keep reading to the end of the chunked body so the
+                    # connection goes back to the pool instead of being discarded
+                    if done or not line or not line.startswith("data:"):
+                        continue  # blank keep-alives and ': OPENROUTER PROCESSING' comments
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        done = True
+                        continue
+                    try:
+                        delta = json.loads(data)['choices'][0].get('delta', {}).get('content') or ""
+                    except (ValueError, KeyError, IndexError):
+                        continue
+                    if not delta:
+                        continue
+                    if stats['first_token_ms'] is None:
+                        stats['first_token_ms'] = (time.perf_counter() - start) * 1000
+                    text += delta
+                    
+                    # Each sentence passes the identity filter before it is spoken
+                    for match in self.SENTENCE_END.finditer(text, emitted):
+                        sentence = text[emitted:match.end()].strip()
+                        if sentence and not emit(sentence):
+                            violation = True
+                            break
+                        emitted = match.end()
+                    if violation:
+                        response.close()  # abandon the rest of the stream
+                        break
+            
+            tail = text[emitted:].strip()
+            if tail and not violation and not emit(tail):
+                violation = True
+            if violation:
+                ok = True
+                logger.warning("Identity filter rejected a streamed sentence; stopped speaking the reply")
+                if emitted:
+                    return text[:emitted].strip()  # the part already spoken; never cached
+                text = self._filter_identity_violations(text)
+                self._record_exchange(prompt, text, use_cache)
+                return text
+            if not text:
+                return "I'm having trouble processing that request, sir."
+            
+            stats['total_ms'] = (time.perf_counter() - start) * 1000
+            logger.info(f"AI stream: first token {stats['first_token_ms']:.0f}ms, "
+                        f"first sentence {stats['first_sentence_ms']:.0f}ms, "
+                        f"total {stats['total_ms']:.0f}ms")
+            self._record_exchange(prompt, text, use_cache)
+            ok = True
+            return text
+        except requests.Timeout as e:
+            error = e
+            if emitted:
+                return text
+            return "AI response timeout. Please try again, sir."
+        except Exception as e:
+            error = e
+            logger.error(f"AI stream error: {e}")
+            if emitted:
+                return text
+            return "I'm having trouble processing that request, sir."
+        finally:
+            self.router.record(route['name'], time.perf_counter() - start, ok)
+            if ok:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure(error)
     
     def _filter_identity_violations(self, response: str) -> str:
         """Filter out any identity violations"""
@@ -1709,7 +4497,7 @@ class WhatsAppController:
     
     def get_call_history(self, limit: int = 10) -> str:
         """Get recent call history"""
-        history = self.data_manager.data.get('call_history', [])[-limit:]
+        history = self.data_manager.get_recent('call_history', limit)
         if not history:
             return "No call history available."
         
@@ -1885,7 +4673,7 @@ Requirements:
 
 Output ONLY the code, no explanations."""
         
-        code = ai.query(prompt)
+        code = ai.query(prompt, intent='code')
         code = re.sub(r'```\w*\n', '', code)
         code = re.sub(r'```', '', code)
         
@@ -2136,26 +4924,76 @@ Disk: {disk.percent}% ({disk.used / (1024**3):.1f}GB / {disk.total / (1024**3):.
 class WeatherService:
     """Weather information service"""
     
-    def __init__(self, config: ConfigManager):
+    FALLBACK_CITY = "Ludhiana"
+    MAX_CITIES = 32
+    
+    def __init__(self, config: ConfigManager, breakers: Optional[CircuitBreakerRegistry] = None,
+                 http: Optional[HttpClient] = None):
         self.config = config
         self.api_key = config.get('weather_api_key')
         self.api_host = config.get('weather_api_host')
-    
-    @timed
-    def get_weather(self, city: Optional[str] = None) -> str:
-        """Get weather information"""
-        if not self.api_key:
-            return "Weather API not configured, sir."
-        
+        self.http = http or HttpClient(config)
+        self.breaker = (breakers or CircuitBreakerRegistry(config)).get('weather', probe=self._probe)
+        self.ttl = config.get('weather_cache_ttl', 600)
+        self.stale_ttl = config.get('weather_stale_ttl', 21600)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()  # city key -> {'fields': {...}, 'fetched': epoch seconds}
+        self._cache_lock = threading.Lock()
+        self._location = None  # (city, resolved_at) from IP geolocation
+        self._inflight = SingleFlight()  # the refresher and a user request never fetch the same city twice
+        self._stop_event = threading.Event()
+        self._refresh_thread = None
+    
+    def _probe(self) -> bool:
+        return self.http.head(f"https://{self.api_host}/", timeout=3).status_code < 500
+    
+    def _default_city(self) -> str:
+        """Configured default_city, else the IP-geolocated city, memoized for geolocation_ttl"""
+        configured = self.config.get('default_city')
+        if configured:
+            return configured
+        if self._location and time.time() - self._location[1] < self.config.get('geolocation_ttl', 86400):
+            return self._location[0]
+        return self._inflight.do("geolocation", self._geolocate)
+    
+    def _geolocate(self) -> str:
+        try:
+            import geocoder
+            g = geocoder.ip('me', session=self.http.session, timeout=3)
+            city = g.city if g.city else None
+        except:
+            city = None
+        if city:
+            self._location = (city, time.time())
+        else:
+            # Retry the lookup in a minute instead of paying for it on every request
+            retry_at = time.time() - self.config.get('geolocation_ttl', 86400) + 60
+            self._location = (self.FALLBACK_CITY, retry_at)
+        return self._location[0]
+    
+    @staticmethod
+    def _format(fields: Dict[str, Any], age: float = 0.0) -> str:
+        note = f" (reading from {int(age // 60)} minutes ago)" if age >= 60 else ""
+        return (f"Weather in {fields['location']}: {fields['temp_c']}°C, {fields['condition']}. "
+                f"Humidity: {fields['humidity']}%. Wind: {fields['wind_kph']} km/h{note}, sir.")
+    
+    def _cached(self, key: str, max_age: float) -> Optional[Tuple[Dict[str, Any], float]]:
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            age = time.time() - entry['fetched']
+            if age > max_age:
+                return None
+            self._cache.move_to_end(key)
+            return entry['fields'], age
+    
+    def _fetch(self, city: str) -> Optional[Dict[str, Any]]:
+        """Query the API and cache the result; None when the service is down or unhelpful"""
+        if not self.breaker.allow():
+            return None
         try:
-            if not city:
-                try:
-                    import geocoder
-                    g = geocoder.ip('me')
-                    city = g.city if g.city else "Ludhiana"
-                except:
-                    city = "Ludhiana"
-            
             url = f"https://{self.api_host}/current.json"
             headers = {
                 "X-RapidAPI-Key": self.api_key,
@@ -2163,23 +5001,240 @@ class WeatherService:
             }
             params = {"q": city}
             
-            response = requests.get(url, headers=headers, params=params, timeout=5)
+            response = self.http.get(url, headers=headers, params=params, timeout=5)
+            if response.status_code >= 500 or response.status_code == 429:
+                self.breaker.record_failure(f"HTTP {response.status_code}")
+            else:
+                self.breaker.record_success()
             
-            if response.status_code == 200:
-                data = response.json()
-                location = data['location']['name']
-                temp_c = data['current']['temp_c']
-                condition = data['current']['condition']['text']
-                humidity = data['current']['humidity']
-                wind_kph = data['current']['wind_kph']
-                
-                return f"Weather in {location}: {temp_c}°C, {condition}. Humidity: {humidity}%. Wind: {wind_kph} km/h, sir."
+            if response.status_code != 200:
+                return None
             
-            return "Could not fetch weather data, sir."
-        
+            data = response.json()
+            fields = {
+                'location': data['location']['name'],
+                'temp_c': data['current']['temp_c'],
+                'condition': data['current']['condition']['text'],
+                'humidity': data['current']['humidity'],
+                'wind_kph': data['current']['wind_kph'],
+            }
+            with self._cache_lock:
+                self._cache[city.strip().lower()] = {'fields': fields, 'fetched': time.time()}
+                self._cache.move_to_end(city.strip().lower())
+                while len(self._cache) > self.MAX_CITIES:
+                    self._cache.popitem(last=False)
+            return fields
         except Exception as e:
+            self.breaker.record_failure(e)
             logger.error(f"Weather error: {e}")
-            return "Weather service unavailable, sir."
+            return None
+    
+    @timed
+    def get_weather(self, city: Optional[str] = None) -> str:
+        """Get weather information"""
+        if not self.api_key:
+            return "Weather API not configured, sir."
+        
+        city = city or self._default_city()
+        key = city.strip().lower()
+        
+        cached = self._cached(key, self.ttl)
+        if cached:
+            self.cache_hits += 1
+            return self._format(*cached)
+        self.cache_misses += 1
+        
+        fields = self._inflight.do(key, self._fetch, city)
+        if fields:
+            return self._format(fields)
+        
+        # Offline or failing upstream: a reading from the last few hours beats no answer
+        stale = self._cached(key, self.stale_ttl)
+        if stale:
+            return self._format(*stale)
+        if self.breaker.state is not CircuitState.CLOSED:
+            return "The weather service is offline at the moment, sir. I'll keep checking."
+        return "Could not fetch weather data, sir."
+    
+    def start_background_refresh(self):
+        """Keep the default city's reading fresh so plain 'weather' answers from memory"""
+        if not self.api_key or self._refresh_thread:
+            return
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, daemon=True, name="weather-refresh")
+        self._refresh_thread.start()
+    
+    def _refresh_loop(self):
+        interval = min(self.config.get('weather_refresh_interval', 300), self.ttl * 0.8)
+        wait = 0
+        while not self._stop_event.wait(wait):
+            city = self._default_city()
+            if self._inflight.do(city.strip().lower(), self._fetch, city) is None:
+                logger.debug(f"Weather refresh for {city} failed; keeping the last reading")
+            wait = interval
+    
+    def stop(self):
+        self._stop_event.set()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.cache_hits + self.cache_misses
+        return {'hits': self.cache_hits, 'misses': self.cache_misses, 'cities': len(self._cache),
+                'hit_rate': self.cache_hits / total if total else 0.0}
+
+# ============================================================================
+# INTENT MATCHER
+# ============================================================================
+class IntentMatcher:
+    """Aho-Corasick keyword automaton for single-pass command dispatch"""
+    
+    def __init__(self, keywords: Optional[Dict[str, Any]] = None):
+        self._entries = {}  # keyword -> (handler, priority, order)
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]
+        self._compiled = False
+        if keywords:
+            for keyword, handler in keywords.items():
+                self.add(keyword, handler)
+            self.compile()
+    
+    def add(self, keyword: str, handler: Any, priority: int = 0):
+        """Register a keyword (re-registering replaces the handler)"""
+        keyword = keyword.lower()
+        if not keyword:
+            return
+        order = self._entries[keyword][2] if keyword in self._entries else len(self._entries)
+        self._entries[keyword] = (handler, priority, order)
+        self._compiled = False
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def _rank(keyword: str, entry: Tuple[Any, int, int]) -> Tuple[int, int, int]:
+        """Higher priority first, then longest keyword, then earliest registration"""
+        return (entry[1], len(keyword), -entry[2])
+    
+    def compile(self):
+        """Build goto/fail tables; each node caches its best reachable keyword"""
+        goto, fail, best = [{}], [0], [None]
+        
+        for keyword in self._entries:
+            node = 0
+            for ch in keyword:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    best.append(None)
+                node = nxt
+            best[node] = keyword
+        
+        # Breadth-first fail links; fold the fail target's best match into each node
+        bfs = deque(goto[0].values())
+        while bfs:
+            node = bfs.popleft()
+            inherited = best[fail[node]]
+            if inherited is not None and (best[node] is None or
+                    self._rank(inherited, self._entries[inherited]) > self._rank(best[node], self._entries[best[node]])):
+                best[node] = inherited
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                bfs.append(child)
+        
+        self._goto, self._fail, self._best = goto, fail, best
+        self._compiled = True
+    
+    def match(self, text: str) -> Optional[Tuple[str, Any]]:
+        """Best (keyword, handler) found in text, or None"""
+        if not self._compiled:
+            self.compile()
+        goto, fail, best, entries = self._goto, self._fail, self._best, self._entries
+        rank = self._rank
+        winner = None
+        winner_rank = None
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            candidate = best[node]
+            if candidate is not None and candidate != winner:
+                candidate_rank = rank(candidate, entries[candidate])
+                if winner is None or candidate_rank > winner_rank:
+                    winner, winner_rank = candidate, candidate_rank
+        if winner is None:
+            return None
+        return winner, entries[winner][0]
+
+# ============================================================================
+# RESPONSE FAST PATH
+# ============================================================================
+class ResponseFastPath:
+    """O(1) exact-match answers for stock phrases, checked before handler dispatch"""
+    
+    def __init__(self, table: Optional[Dict[str, Any]] = None, hotword: str = "jarvis"):
+        self.table = table if table is not None else {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._hotword_re = hotword_pattern(hotword)
+        # Re-key whatever was passed in so lookups only ever compare normalized text
+        for phrase in list(self.table):
+            self.table[self.normalize(phrase)] = self.table.pop(phrase)
+    
+    def normalize(self, text: str) -> str:
+        return normalize_utterance(text, self._hotword_re)
+    
+    def add(self, phrase: str, response: Any):
+        """Register a static string or a zero-argument callable"""
+        key = self.normalize(phrase)
+        if key:
+            with self._lock:
+                self.table[key] = response
+    
+    def load_custom_commands(self, custom_commands: Dict[str, Any]) -> int:
+        """Load user-defined phrase -> response pairs (jarvis_data.json 'custom_commands')"""
+        loaded = 0
+        for phrase, response in (custom_commands or {}).items():
+            if isinstance(response, dict):
+                response = response.get('response')
+            if isinstance(response, str) and response.strip():
+                self.add(phrase, response)
+                loaded += 1
+            else:
+                logger.warning(f"Ignoring custom command without a text response: {phrase}")
+        return loaded
+    
+    def lookup(self, text: str) -> Optional[str]:
+        """Return the cached answer for text, evaluating callables lazily"""
+        response = self.table.get(self.normalize(text)) if text else None
+        with self._lock:
+            if response is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        if callable(response):
+            try:
+                response = response()
+            except Exception as e:
+                logger.error(f"Fast path response error: {e}")
+                return None
+        return response
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.table),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
 
 # ============================================================================
 # COMMAND PROCESSOR
@@ -2187,6 +5242,31 @@ class WeatherService:
 class CommandProcessor:
     """Advanced command processing with all features"""
     
+    # Fixed replies (also pre-rendered to speech at startup)
+    CREATOR_RESPONSES = (
+        "I was created by Singh Industries, sir. My creator is Mr. Prabhnoor Singh.",
+        "Singh Industries designed and developed me. Mr. Prabhnoor Singh is my creator, sir.",
+        "Mr. Prabhnoor Singh of Singh Industries engineered every aspect of my intelligence, sir.",
+        "I am a product of Singh Industries, created by Mr. Prabhnoor Singh, sir.",
+    )
+    IDENTITY_RESPONSES = (
+        "I am JARVIS, Just A Rather Very Intelligent System, created by Mr. Prabhnoor Singh of Singh Industries, sir.",
+        "My name is JARVIS. I was designed and built by Mr. Prabhnoor Singh at Singh Industries, sir.",
+        "I'm JARVIS, your AI assistant, engineered by Mr. Prabhnoor Singh of Singh Industries, sir.",
+    )
+    MODE_RESPONSES = (
+        ("silent", OperationMode.SILENT, "Silent mode activated, sir. I'll keep my voice down."),
+        ("night", OperationMode.NIGHT, "Night mode activated, sir. Reducing volume and brightness for your comfort."),
+        ("idle", OperationMode.IDLE, "Idle mode activated, sir. I'll be quiet unless you need me."),
+        ("active", OperationMode.ACTIVE, "Active mode restored, sir. Ready for rapid response."),
+        ("alert", OperationMode.ALERT, "Alert mode activated, sir. Standing by for urgent commands."),
+        ("developer", OperationMode.DEVELOPER, "Developer mode activated, sir. Coding systems at full capacity."),
+        ("presentation", OperationMode.PRESENTATION, "Presentation mode activated, sir. Optimized for public speaking."),
+        ("safe", OperationMode.SAFE, "Safe mode activated, sir. High-risk operations will require additional confirmation."),
+        ("normal", OperationMode.NORMAL, "Normal mode activated, sir. All systems operating at standard parameters."),
+    )
+    MODES_HELP = "Available modes: normal, active, idle, silent, night, alert, developer, presentation, safe, sir."
+    
     def __init__(self, jarvis_instance):
         self.jarvis = jarvis_instance
         self.executor = ThreadPoolExecutor(max_workers=4)
@@ -2250,6 +5330,11 @@ class CommandProcessor:
             'who are you': self._handle_identity,
             'what is your name': self._handle_identity,
         }
+        self._compile_handlers()
+    
+    def _compile_handlers(self):
+        """Compile the handler table into a single-pass intent matcher"""
+        self.intent_matcher = IntentMatcher(self.handlers)
     
     def process(self, command: str) -> Optional[str]:
         """Process command"""
@@ -2277,14 +5362,15 @@ class CommandProcessor:
         if any(x in cmd_lower for x in ["stop", "exit", "quit", "goodbye", "bye"]):
             return "SESSION_END"
         
-        # Match command to handler
-        for keyword, handler in self.handlers.items():
-            if keyword in cmd_lower:
-                try:
-                    return handler(command, cmd_lower)
-                except Exception as e:
-                    logger.error(f"Handler error: {e}")
-                    return f"Error executing command: {str(e)}"
+        # Match command to handler (longest keyword wins, e.g. 'play music' over 'play')
+        match = self.intent_matcher.match(cmd_lower)
+        if match:
+            handler = match[1]
+            try:
+                return handler(command, cmd_lower)
+            except Exception as e:
+                logger.error(f"Handler error: {e}")
+                return f"Error executing command: {str(e)}"
         
         # No handler matched - return None for AI processing
         return None
@@ -2482,34 +5568,11 @@ class CommandProcessor:
         return self.jarvis.system_controller.get_battery_status()
     
     def _handle_mode(self, cmd, cmd_lower):
-        if "silent" in cmd_lower:
-            self.jarvis.set_mode(OperationMode.SILENT)
-            return "Silent mode activated, sir. I'll keep my voice down."
-        elif "night" in cmd_lower:
-            self.jarvis.set_mode(OperationMode.NIGHT)
-            return "Night mode activated, sir. Reducing volume and brightness for your comfort."
-        elif "idle" in cmd_lower:
-            self.jarvis.set_mode(OperationMode.IDLE)
-            return "Idle mode activated, sir. I'll be quiet unless you need me."
-        elif "active" in cmd_lower:
-            self.jarvis.set_mode(OperationMode.ACTIVE)
-            return "Active mode restored, sir. Ready for rapid response."
-        elif "alert" in cmd_lower:
-            self.jarvis.set_mode(OperationMode.ALERT)
-            return "Alert mode activated, sir. Standing by for urgent commands."
-        elif "developer" in cmd_lower:
-            self.jarvis.set_mode(OperationMode.DEVELOPER)
-            return "Developer mode activated, sir. Coding systems at full capacity."
-        elif "presentation" in cmd_lower:
-            self.jarvis.set_mode(OperationMode.PRESENTATION)
-            return "Presentation mode activated, sir. Optimized for public speaking."
-        elif "safe" in cmd_lower:
-            self.jarvis.set_mode(OperationMode.SAFE)
-            return "Safe mode activated, sir. High-risk operations will require additional confirmation."
-        elif "normal" in cmd_lower:
-            self.jarvis.set_mode(OperationMode.NORMAL)
-            return "Normal mode activated, sir. All systems operating at standard parameters."
-        return "Available modes: normal, active, idle, silent, night, alert, developer, presentation, safe, sir."
+        for keyword, mode, response in self.MODE_RESPONSES:
+            if keyword in cmd_lower:
+                self.jarvis.set_mode(mode)
+                return response
+        return self.MODES_HELP
     
     def _handle_change_voice(self, cmd, cmd_lower):
         if " to " in cmd_lower:
@@ -2541,21 +5604,10 @@ class CommandProcessor:
         return "Please provide text to detect language, sir."
     
     def _handle_creator(self, cmd, cmd_lower):
-        responses = [
-            "I was created by Singh Industries, sir. My creator is Mr. Prabhnoor Singh.",
-            "Singh Industries designed and developed me. Mr. Prabhnoor Singh is my creator, sir.",
-            "Mr. Prabhnoor Singh of Singh Industries engineered every aspect of my intelligence, sir.",
-            "I am a product of Singh Industries, created by Mr. Prabhnoor Singh, sir.",
-        ]
-        return random.choice(responses)
+        return random.choice(self.CREATOR_RESPONSES)
     
     def _handle_identity(self, cmd, cmd_lower):
-        responses = [
-            "I am JARVIS, Just A Rather Very Intelligent System, created by Mr. Prabhnoor Singh of Singh Industries, sir.",
-            "My name is JARVIS. I was designed and built by Mr. Prabhnoor Singh at Singh Industries, sir.",
-            "I'm JARVIS, your AI assistant, engineered by Mr. Prabhnoor Singh of Singh Industries, sir.",
-        ]
-        return random.choice(responses)
+        return random.choice(self.IDENTITY_RESPONSES)
 
 # ============================================================================
 # ENHANCED COMMAND PROCESSOR
@@ -2588,6 +5640,10 @@ class EnhancedCommandProcessor(CommandProcessor):
             'what\'s playing': self._handle_now_playing,
             'current song': self._handle_now_playing,
             'next song': self._handle_next_song,
+            'skip song': self._handle_next_song,
+            'queue song': self._handle_queue_song,
+            'to playlist': self._handle_queue_song,
+            'play playlist': self._handle_play_playlist,
             'search music': self._handle_search_music,
             'trending music': self._handle_trending_music,
             'music history': self._handle_music_history,
@@ -2601,6 +5657,7 @@ class EnhancedCommandProcessor(CommandProcessor):
             'change accent': self._handle_change_accent,
             'voice style': self._handle_voice_style,
         })
+        self._compile_handlers()
     
     def _handle_play(self, cmd, cmd_lower):
         """Handle play command"""
@@ -2686,7 +5743,23 @@ class EnhancedCommandProcessor(CommandProcessor):
     
     def _handle_next_song(self, cmd, cmd_lower):
         """Play next song"""
-        return "Playlist feature coming soon, sir. For now, please specify a song to play."
+        return self.jarvis.music_controller.next_track()
+    
+    def _handle_queue_song(self, cmd, cmd_lower):
+        """Add a song to the playlist ('queue song X' or 'add X to playlist')"""
+        if "queue song" in cmd_lower:
+            query = cmd_lower.split("queue song", 1)[1].strip()
+        else:
+            query = cmd_lower.split("to playlist", 1)[0].strip()
+            if query.startswith("add "):
+                query = query[4:].strip()
+        if not query:
+            return "Which song should I add, sir?"
+        return self.jarvis.music_controller.add_to_playlist(query)
+    
+    def _handle_play_playlist(self, cmd, cmd_lower):
+        """Play the playlist from the start"""
+        return self.jarvis.music_controller.play_playlist()
     
     def _handle_search_music(self, cmd, cmd_lower):
         """Search for music"""
@@ -2766,6 +5839,31 @@ class EnhancedCommandProcessor(CommandProcessor):
 class JarvisMarkIEnhanced:
     """JARVIS MARK I ENHANCED - Complete Ultimate AI Assistant with Music & Enhanced Voice"""
     
+    STARTUP_MESSAGES = (
+        "JARVIS MARK I ENHANCED online and ready, sir. All systems operational.",
+        "Good to see you, sir. JARVIS MARK I ENHANCED at your service.",
+        "Systems initialized successfully. How may I assist you today, sir?",
+        "JARVIS MARK I ENHANCED reporting for duty. Ready for your commands, sir.",
+    )
+    SESSION_GREETINGS = (
+        "I'm listening, sir. How may I assist you?",
+        "At your service. What do you need, sir?",
+        "Ready and waiting. What can I do for you, sir?",
+        "Systems online. How can I help, sir?",
+    )
+    SESSION_FAREWELLS = (
+        "Session ended. I'll be here when you need me, sir.",
+        "Signing off. Call me anytime, sir.",
+        "Going into standby mode. Just say my name when you're ready, sir.",
+        "Session closed. I'm always here if you need anything, sir.",
+    )
+    SHUTDOWN_MESSAGES = (
+        "Powering down systems. Goodbye, sir.",
+        "Shutting down. It's been a pleasure serving you, sir.",
+        "Going offline. Until next time, sir.",
+        "Systems shutting down. Stay safe, sir.",
+    )
+    
     def __init__(self):
         print("\n" + "="*70)
         print("  🤖 JARVIS MARK I - ENHANCED ULTIMATE EDITION")
@@ -2783,7 +5881,11 @@ class JarvisMarkIEnhanced:
         
         # Initialize core systems
         self.config = ConfigManager()
-        self.data_manager = DataManager()
+        self.data_manager = DataManager(
+            storage_mode=self.config.get('data_storage_mode', 'json'),
+            journal_compact_bytes=self.config.get('journal_compact_bytes', 262144),
+            autosave_interval=self.config.get('autosave_interval', 5)
+        )
         self.os_manager = OSManager()
         self.os_type = self.os_manager.get_os_type()
         
@@ -2806,8 +5908,17 @@ class JarvisMarkIEnhanced:
             self.recognizer = None
             print("⚠️ Voice recognition unavailable. Text mode only.")
         
+        # Shared circuit breakers so a dead upstream fails fast instead of stalling the voice loop
+        self.breakers = CircuitBreakerRegistry(self.config)
+        
+        # One pooled HTTP client for every service; pre-connect to the hosts used most
+        self.http = HttpClient(self.config)
+        self.http.warm_up(self.config.get('http_warmup_urls') or [
+            self.config.get('api_url'), f"https://{self.config.get('weather_api_host')}/"
+        ])
+        
         # Initialize AI and safety
-        self.ai = AIInterface(self.config, self.data_manager)
+        self.ai = AIInterface(self.config, self.data_manager, self.breakers, self.http)
         self.safety_layer = SafetyLayer(self.config)
         
         # Initialize controllers
@@ -2817,14 +5928,19 @@ class JarvisMarkIEnhanced:
         self.vscode_controller = VSCodeController(self.config, self.data_manager)
         self.file_manager = FileManager(self.safety_layer, self.data_manager)
         self.system_controller = SystemController(self.os_type, self.safety_layer)
-        self.weather_service = WeatherService(self.config)
+        self.weather_service = WeatherService(self.config, self.breakers, self.http)
+        self.weather_service.start_background_refresh()
         
         # Initialize MUSIC CONTROLLER
-        self.music_controller = YouTubeMusicController(self.config, self.data_manager)
+        self.music_controller = YouTubeMusicController(self.config, self.data_manager, self.breakers, self.http)
         
         # Initialize ENHANCED command processor
         self.command_processor = EnhancedCommandProcessor(self)
         
+        # Exact-match fast path over the pre-cached and user-defined responses
+        self.fast_path = ResponseFastPath(self.response_cache, self.config.get('hotword', 'jarvis'))
+        self.fast_path.load_custom_commands(self.data_manager.data.get('custom_commands', {}))
+        
         # Session state
         self.active_session = False
         self.shutdown_flag = False
@@ -2847,6 +5963,13 @@ class JarvisMarkIEnhanced:
         if self.config.get('system_monitoring', True):
             self.system_monitor.start_monitoring()
         
+        # Synthesize the stock phrases ahead of first use; pauses while a command is heard or speech plays
+        if self.config.get('tts_prerender', True):
+            self.enhanced_speech_manager.prerender(
+                self._phrase_inventory(),
+                busy=lambda: self.system_state == SystemState.LISTENING
+            )
+        
         self._print_enhanced_startup_info()
 
     def _precache_responses(self):
@@ -2861,6 +5984,18 @@ class JarvisMarkIEnhanced:
             "who are you": "I am JARVIS, created by Mr. Prabhnoor Singh of Singh Industries, sir.",
         }
     
+    def _phrase_inventory(self) -> List[str]:
+        """Every fixed line JARVIS speaks, most frequently heard first"""
+        processor = self.command_processor
+        phrases = [
+            *self.STARTUP_MESSAGES, *self.SESSION_GREETINGS, *self.SESSION_FAREWELLS,
+            *(reply for reply in self.response_cache.values() if isinstance(reply, str)),
+            *processor.IDENTITY_RESPONSES, *processor.CREATOR_RESPONSES,
+            *(response for _, _, response in processor.MODE_RESPONSES), processor.MODES_HELP,
+            *self.SHUTDOWN_MESSAGES,
+        ]
+        return list(dict.fromkeys(phrases))
+    
     def _calibrate_microphone(self):
         """Calibrate microphone safely"""
         try:
@@ -2909,11 +6044,14 @@ class JarvisMarkIEnhanced:
         self.operation_mode = mode
         self.enhanced_speech_manager.operation_mode = mode
     
-    def speak(self, text: str, language: str = None, human_like: bool = None):
-        """Enhanced speak method"""
-        self.system_state = SystemState.SPEAKING
-        self.enhanced_speech_manager.speak(text, language, human_like)
-        self.system_state = SystemState.IDLE
+    def speak(self, text: str, language: str = None, human_like: bool = None,
+              priority: SpeechPriority = SpeechPriority.RESPONSE) -> SpeechHandle:
+        """Queue speech; returns a handle to wait on or cancel"""
+        return self.enhanced_speech_manager.speak(text, language, human_like, priority)
+    
+    def interrupt_speech(self) -> int:
+        """Barge-in: cut off the current reply and drop queued ones (alerts are kept)"""
+        return self.enhanced_speech_manager.interrupt()
     
     def listen(self, timeout: int = None) -> Optional[str]:
         """Listen for voice input safely"""
@@ -2955,6 +6093,7 @@ class JarvisMarkIEnhanced:
             return False
         
         hotword = self.config.get('hotword', 'jarvis')
+        self.system_state = SystemState.HOTWORD
         try:
             with self.mic as source:
                 audio = self.recognizer.listen(source, timeout=3, phrase_time_limit=5)
@@ -2962,12 +6101,17 @@ class JarvisMarkIEnhanced:
                 return hotword in text
         except:
             return False
+        finally:
+            self.system_state = SystemState.IDLE
     
-    def process_command(self, command: str) -> Optional[str]:
-        """Process command"""
+    def process_command(self, command: str, on_sentence=None) -> Optional[str]:
+        """Process command; with on_sentence, AI answers are streamed sentence by sentence"""
         if not command:
             return None
         
+        # A new command supersedes whatever is still being said
+        self.interrupt_speech()
+        
         self.system_state = SystemState.PROCESSING
         self.stats['commands_processed'] += 1
         self.data_manager.log_command(command)
@@ -2975,6 +6119,13 @@ class JarvisMarkIEnhanced:
         # Add to context memory
         self.context_memory.add_interaction(command)
         
+        # Fast path: stock phrases answer without handler dispatch or AI
+        if not self.command_processor.pending_confirmation:
+            result = self.fast_path.lookup(command)
+            if result:
+                self.system_state = SystemState.IDLE
+                return result
+        
         # Process through command processor
         result = self.command_processor.process(command)
         
@@ -2984,20 +6135,24 @@ class JarvisMarkIEnhanced:
         elif not result:
             # No handler matched - use AI
             self.stats['ai_queries'] += 1
-            result = self.ai.query(command)
+            if on_sentence and self.config.get('ai_streaming', True):
+                result = self.ai.query_stream(command, on_sentence)
+            else:
+                result = self.ai.query(command)
         
         self.system_state = SystemState.IDLE
         return result
     
+    def add_custom_command(self, phrase: str, response: str) -> str:
+        """Teach JARVIS a fixed reply; persisted to custom_commands"""
+        self.fast_path.add(phrase, response)
+        self.data_manager.add_custom_command(phrase, response)
+        return f"Understood, sir. I'll answer '{phrase}' from now on."
+    
     def run_session(self):
         """Run active session"""
-        greetings = [
-            "I'm listening, sir. How may I assist you?",
-            "At your service. What do you need, sir?",
-            "Ready and waiting. What can I do for you, sir?",
-            "Systems online. How can I help, sir?",
-        ]
-        self.speak(random.choice(greetings))
+        # Speech is waited for before the microphone opens, so JARVIS does not hear itself
+        self.speak(random.choice(self.SESSION_GREETINGS), priority=SpeechPriority.CHATTER).wait()
         
         while self.active_session and not self.shutdown_flag:
             try:
@@ -3007,19 +6162,16 @@ class JarvisMarkIEnhanced:
                     # Check for exit commands
                     if any(x in command for x in ["stop", "exit", "quit", "goodbye", "bye"]):
                         self.active_session = False
-                        farewells = [
-                            "Session ended. I'll be here when you need me, sir.",
-                            "Signing off. Call me anytime, sir.",
-                            "Going into standby mode. Just say my name when you're ready, sir.",
-                            "Session closed. I'm always here if you need anything, sir.",
-                        ]
-                        self.speak(random.choice(farewells))
+                        self.speak(random.choice(self.SESSION_FAREWELLS)).wait()
                         break
                     
-                    # Process command
-                    result = self.process_command(command)
-                    if result:
-                        self.speak(result)
+                    # Process command (AI answers start speaking while still streaming)
+                    speaker = StreamingSpeaker(self.speak)
+                    result = self.process_command(command, on_sentence=speaker.feed)
+                    if speaker.started:
+                        speaker.finish()
+                    elif result:
+                        self.speak(result).wait()
             
             except KeyboardInterrupt:
                 self.active_session = False
@@ -3030,13 +6182,7 @@ class JarvisMarkIEnhanced:
     
     def run(self):
         """Main run loop"""
-        startup_messages = [
-            "JARVIS MARK I ENHANCED online and ready, sir. All systems operational.",
-            "Good to see you, sir. JARVIS MARK I ENHANCED at your service.",
-            "Systems initialized successfully. How may I assist you today, sir?",
-            "JARVIS MARK I ENHANCED reporting for duty. Ready for your commands, sir.",
-        ]
-        self.speak(random.choice(startup_messages))
+        self.speak(random.choice(self.STARTUP_MESSAGES), priority=SpeechPriority.CHATTER).wait()
         
         try:
             while not self.shutdown_flag:
@@ -3045,7 +6191,7 @@ class JarvisMarkIEnhanced:
                     alerts = self.system_monitor.get_pending_alerts()
                     for alert in alerts:
                         if alert['level'] == 'critical':
-                            self.speak(f"Alert, sir. {alert['message']}")
+                            self.speak(f"Alert, sir. {alert['message']}", priority=SpeechPriority.ALERT).wait()
                     
                     # Listen for hotword
                     if self.hotword_listen():
@@ -3068,19 +6214,15 @@ class JarvisMarkIEnhanced:
     def shutdown(self):
         """Shutdown JARVIS"""
         print("\n⚡ Shutting down JARVIS MARK I ENHANCED...")
-        shutdown_messages = [
-            "Powering down systems. Goodbye, sir.",
-            "Shutting down. It's been a pleasure serving you, sir.",
-            "Going offline. Until next time, sir.",
-            "Systems shutting down. Stay safe, sir.",
-        ]
-        self.speak(random.choice(shutdown_messages))
-        time.sleep(2)
+        self.speak(random.choice(self.SHUTDOWN_MESSAGES)).wait(timeout=10)
         
         # Stop all systems
         self.enhanced_speech_manager.stop()
-        self.music_controller.stop()
+        self.music_controller.shutdown()
         self.system_monitor.stop_monitoring()
+        self.breakers.shutdown()
+        self.weather_service.stop()
+        self.http.close()
         self.data_manager.shutdown()
         
         # Print statistics
@@ -3091,6 +6233,49 @@ class JarvisMarkIEnhanced:
         print(f"Uptime: {uptime}")
         print(f"Commands processed: {self.stats['commands_processed']}")
         print(f"AI queries: {self.stats['ai_queries']}")
+        fast_stats = self.fast_path.get_stats()
+        print(f"Fast-path hits: {fast_stats['hits']}/{fast_stats['hits'] + fast_stats['misses']} "
+              f"({fast_stats['hit_rate']:.0%})")
+        cache_stats = self.ai.response_cache.get_stats()
+        print(f"AI cache hits: {cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']} "
+              f"({cache_stats['hit_rate']:.0%}), {cache_stats['entries']} entries")
+        flight_stats = self.ai.inflight.get_stats()
+        context_stats = self.ai.context.get_stats()
+        print(f"AI context: {context_stats['turns']} turns, ~{context_stats['tokens']} tokens, "
+              f"{context_stats['folded']} folded into summary")
+        for name, route_stats in self.ai.router.get_stats().items():
+            if route_stats['requests']:
+                print(f"AI {name}: {route_stats['requests']} requests, p50 {route_stats['p50_ms']:.0f}ms, "
+                      f"p95 {route_stats['p95_ms']:.0f}ms, {route_stats['errors']} errors "
+                      f"(max_tokens {route_stats['max_tokens']})")
+        for name, breaker_stats in self.breakers.states().items():
+            if breaker_stats['opened']:
+                print(f"Circuit {name}: opened {breaker_stats['opened']}x, "
+                      f"{breaker_stats['rejected']} calls failed fast, now {breaker_stats['state']}")
+        for host, host_stats in self.http.get_stats()['hosts'].items():
+            print(f"HTTP {host}: {host_stats['requests']} requests, {host_stats['new_connections']} new connections "
+                  f"(dns {host_stats['dns_ms']:.0f} / connect {host_stats['connect_ms']:.0f} / "
+                  f"tls {host_stats['tls_ms']:.0f} ms), ttfb {host_stats['ttfb_ms']:.0f} ms")
+        if self.music_controller.extractor:
+            yt_stats = self.music_controller.extractor.get_stats()
+            print(f"YouTube cache: {yt_stats['search_hits']} search hits, {yt_stats['stream_hits']} stream-URL hits "
+                  f"({yt_stats['stream_expired']} expired)")
+        if self.music_controller.audio_cache:
+            audio_stats = self.music_controller.audio_cache.get_stats()
+            print(f"Audio cache: {audio_stats['hits']} local replays, {audio_stats['tracks']} tracks, "
+                  f"{audio_stats['bytes'] // (1024 * 1024)} MB")
+        first_audio = sorted(self.enhanced_speech_manager.first_audio_ms)
+        if first_audio:
+            print(f"Speech first audio: p50 {first_audio[len(first_audio) // 2]:.0f}ms over {len(first_audio)} utterances")
+        speech_cache = self.enhanced_speech_manager.audio_cache
+        if speech_cache:
+            speech_stats = speech_cache.get_stats()
+            print(f"Speech cache hits: {speech_stats['hits']}/{speech_stats['hits'] + speech_stats['misses']} "
+                  f"({speech_stats['hit_rate']:.0%}), {speech_stats['saved_ms'] / 1000:.1f}s of synthesis saved")
+        weather_stats = self.weather_service.get_stats()
+        if weather_stats['hits'] + weather_stats['misses']:
+            print(f"Weather cache hits: {weather_stats['hits']}/{weather_stats['hits'] + weather_stats['misses']}")
+        print(f"AI requests coalesced: {flight_stats['shared']} (of {flight_stats['calls'] + flight_stats['shared']})")
         print(f"Music played: {self.stats['music_played']}")
         print("="*60 + "\n")
         print("✓ Shutdown complete.\n")
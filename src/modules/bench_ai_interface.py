@@ -0,0 +1,149 @@
+"""
+JARVIS MARK I - AI INTERFACE LOAD BENCHMARK
+Fires concurrent AIInterface.query calls through the real requests.Session path
+against the local stand-in server (or any --url) and reports latency percentiles,
+throughput and response-cache effectiveness. Run from the repository root:
+
+    python src/modules/bench_ai_interface.py --requests 200 --concurrency 8 --repeat 0.3
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from jarvis import AIInterface, ConfigManager, DataManager
+from mock_ai_server import add_arguments, config_from_args, start_server
+
+
+# One of each routing class: chat, factual, code
+PROMPT_TEMPLATES = (
+    "hello there number {i}",
+    "Explain topic number {i} briefly",
+    "Write a python function that returns {i}",
+)
+
+
+def percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def build_prompts(count: int, repeat: float, seed: int) -> list:
+    """`repeat` is the fraction of prompts that re-ask an earlier question"""
+    rng = random.Random(seed)
+    prompts = []
+    for i in range(count):
+        if prompts and rng.random() < repeat:
+            prompts.append(rng.choice(prompts))
+        else:
+            prompts.append(rng.choice(PROMPT_TEMPLATES).format(i=i))
+    return prompts
+
+
+def make_ai(workdir: Path, url: str, timeout: float, use_persistence: bool) -> AIInterface:
+    config = ConfigManager(str(workdir / "bench_config.json"))
+    config.set('api_url', url)
+    config.set('ai_timeout', timeout)
+    data_manager = DataManager(str(workdir / "bench_data.json"), autosave_interval=0) if use_persistence else None
+    return AIInterface(config, data_manager)
+
+
+def run(ai: AIInterface, prompts: list, concurrency: int, stream: bool) -> dict:
+    latencies, first_tokens = [], []
+    failures = 0
+
+    def one(prompt: str):
+        start = time.perf_counter()
+        if stream:
+            result = ai.query_stream(prompt, lambda sentence: None)
+        else:
+            result = ai.query(prompt)
+        return time.perf_counter() - start, result, dict(ai.stream_stats) if stream else {}
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for elapsed, result, stream_stats in pool.map(one, prompts):
+            latencies.append(elapsed * 1000)
+            if stream_stats.get('first_token_ms') is not None:
+                first_tokens.append(stream_stats['first_token_ms'])
+            if "trouble processing" in result or "timeout" in result.lower() or result == AIInterface.OFFLINE_REPLY:
+                failures += 1
+    wall = time.perf_counter() - wall_start
+
+    return {
+        'latencies': latencies,
+        'first_tokens': first_tokens,
+        'failures': failures,
+        'wall': wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AIInterface against a local stand-in")
+    parser.add_argument("--url", default=None, help="use an already running server instead of starting one")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repeat", type=float, default=0.25, help="fraction of repeated prompts")
+    parser.add_argument("--stream", action="store_true", help="use query_stream instead of query")
+    parser.add_argument("--ai-timeout", type=float, default=8.0)
+    parser.add_argument("--no-persistence", action="store_true", help="skip the DataManager-backed cache")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server_config = None
+    url = args.url
+    if not url:
+        server_config = config_from_args(args)
+        _, url = start_server(server_config)
+
+    prompts = build_prompts(args.requests, args.repeat, args.seed or 0)
+    with tempfile.TemporaryDirectory() as tmp:
+        ai = make_ai(Path(tmp), url, args.ai_timeout, not args.no_persistence)
+        result = run(ai, prompts, args.concurrency, args.stream)
+        cache = ai.response_cache.get_stats()
+        flights = ai.inflight.get_stats()
+        routes = ai.router.get_stats()
+        breaker = ai.breaker.snapshot()
+        http = ai.http.get_stats()
+
+    latencies = result['latencies']
+    print(f"\nAIInterface.{'query_stream' if args.stream else 'query'} -> {url}")
+    print(f"  requests      {len(latencies)} @ concurrency {args.concurrency}")
+    print(f"  throughput    {len(latencies) / result['wall']:.1f} req/s ({result['wall']:.2f}s wall)")
+    print(f"  latency ms    p50 {percentile(latencies, 50):.1f}  p95 {percentile(latencies, 95):.1f}  "
+          f"p99 {percentile(latencies, 99):.1f}  mean {statistics.mean(latencies):.1f}")
+    if result['first_tokens']:
+        ft = result['first_tokens']
+        print(f"  first token   p50 {percentile(ft, 50):.1f}  p95 {percentile(ft, 95):.1f} ms")
+    print(f"  failures      {result['failures']}")
+    print(f"  cache         {cache['hits']} hits / {cache['misses']} misses ({cache['hit_rate']:.0%}), "
+          f"{cache['entries']} entries, {cache['bytes']} bytes")
+    print(f"  coalesced     {flights['shared']} callers joined an in-flight request")
+    for name, route in routes.items():
+        if route['requests']:
+            print(f"  route {name:<8}{route['requests']} upstream, p50 {route['p50_ms']:.0f} ms, "
+                  f"p95 {route['p95_ms']:.0f} ms, max_tokens {route['max_tokens']}")
+    print(f"  circuit       {breaker['state']}, opened {breaker['opened']}x, {breaker['rejected']} calls failed fast")
+    for host, phases in http['hosts'].items():
+        print(f"  http {host}  {phases['new_connections']} new connections for {phases['requests']} requests "
+              f"(dns {phases['dns_ms']:.1f} / connect {phases['connect_ms']:.1f} / tls {phases['tls_ms']:.1f} ms), "
+              f"ttfb {phases['ttfb_ms']:.0f} ms, DNS cache {http['dns_hits']} hits / {http['dns_misses']} misses")
+    if server_config:
+        upstream = server_config.stats()
+        saved = 1 - upstream['requests'] / len(latencies) if latencies else 0.0
+        print(f"  upstream      {upstream['requests']} requests ({saved:.0%} avoided), "
+              f"{upstream['errors']} injected errors, {upstream['hangs']} injected hangs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+JARVIS MARK I - AI PAYLOAD ENCODING BENCHMARK
+Compares the per-request cost of building and serializing the chat payload the old
+way (fresh dict + requests' json= encoding) with AIInterface._encode_payload, which
+reuses the pre-encoded system prefix. Run from the repository root:
+
+    python src/modules/bench_ai_payload.py --context 4 --rounds 5000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from jarvis import AIInterface, ConfigManager
+
+PROMPT = "What is the weather like on Mars today?"
+
+
+def legacy_body(ai: AIInterface, prompt: str) -> bytes:
+    """What query() used to send: a rebuilt message list encoded by requests (ensure_ascii, spaced)"""
+    payload = ai._build_payload(prompt)
+    return json.dumps(payload).encode('utf-8')
+
+
+def per_call_us(fn, rounds: int) -> float:
+    start = time.process_time()
+    for _ in range(rounds):
+        fn()
+    return (time.process_time() - start) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AI request payload encoding")
+    parser.add_argument("--context", type=int, default=4, help="exchanges already in the conversation")
+    parser.add_argument("--rounds", type=int, default=5000)
+    parser.add_argument("--model", default=None, help="override the configured model")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = ConfigManager(str(Path(tmp) / "bench_config.json"))
+        if args.model:
+            config.set('model', args.model)
+        ai = AIInterface(config, None)
+        ai.context.max_messages = max(ai.context.max_messages, args.context * 2)
+        for i in range(args.context):
+            ai._record_exchange(f"Question {i} about the arc reactor", f"Certainly, sir. Answer {i}.", use_cache=False)
+
+        legacy = legacy_body(ai, PROMPT)
+        encoded = ai._encode_payload(PROMPT)
+        assert json.loads(encoded) == json.loads(legacy), "encoded payload differs from the dict payload"
+
+        legacy_us = per_call_us(lambda: legacy_body(ai, PROMPT), args.rounds)
+        encoded_us = per_call_us(lambda: ai._encode_payload(PROMPT), args.rounds)
+
+    print(f"\nPayload encoding ({ai.model}, {args.context} exchanges of context)")
+    print(f"  prompt caching  {'cache_control breakpoint on system prompt' if ai.model.startswith(AIInterface.PROMPT_CACHE_MODELS) and config.get('ai_prompt_caching', True) else 'off'}")
+    print(f"  {'':16}{'CPU us/req':>12}{'bytes/req':>12}")
+    print(f"  {'legacy':16}{legacy_us:>12.1f}{len(legacy):>12}")
+    print(f"  {'pre-encoded':16}{encoded_us:>12.1f}{len(encoded):>12}")
+    print(f"  {'saving':16}{1 - encoded_us / legacy_us:>12.0%}{1 - len(encoded) / len(legacy):>12.0%}")
+
+
+if __name__ == "__main__":
+    main()
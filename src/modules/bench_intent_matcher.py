@@ -0,0 +1,71 @@
+"""
+JARVIS MARK I - INTENT MATCHER BENCHMARK
+Compares the legacy linear keyword scan with the compiled IntentMatcher
+as the handler table grows. Run from the repository root:
+
+    python src/modules/bench_intent_matcher.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from jarvis import IntentMatcher
+
+COMMANDS = [
+    "what time is it",
+    "play music by arijit singh",
+    "open in vscode my project",
+    "send message to mom: running late",
+    "tell me something interesting about black holes",
+    "set volume to 40",
+]
+
+
+def build_table(size: int) -> dict:
+    """Synthetic handler table of the given size (real keywords first)"""
+    rng = random.Random(size)
+    table = {
+        'time': 1, 'open': 2, 'open in vscode': 3, 'play': 4,
+        'play music': 5, 'send message': 6, 'set volume': 7,
+    }
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    while len(table) < size:
+        words = [''.join(rng.choice(letters) for _ in range(rng.randint(3, 8)))
+                 for _ in range(rng.randint(1, 3))]
+        table[' '.join(words)] = len(table)
+    return table
+
+
+def linear_scan(table: dict, text: str):
+    """Substring test per keyword, keeping the longest hit (same result as the matcher)"""
+    best = None
+    for keyword, handler in table.items():
+        if keyword in text and (best is None or len(keyword) > len(best[0])):
+            best = (keyword, handler)
+    return best
+
+
+def time_per_command(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for command in COMMANDS:
+            fn(command)
+    return (time.perf_counter() - start) / (rounds * len(COMMANDS)) * 1e6
+
+
+def main():
+    rounds = 500
+    print(f"{'keywords':>10} {'linear (us)':>14} {'matcher (us)':>14} {'speedup':>9}")
+    for size in (10, 80, 500, 2000, 10000):
+        table = build_table(size)
+        matcher = IntentMatcher(table)
+        linear_us = time_per_command(lambda c: linear_scan(table, c), rounds)
+        matcher_us = time_per_command(matcher.match, rounds)
+        print(f"{size:>10} {linear_us:>14.2f} {matcher_us:>14.2f} {linear_us / matcher_us:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+JARVIS MARK I - ESPEAK-NG SYNTHESIS BENCHMARK
+Compares the per-utterance cost of the espeak-ng command (one process per utterance,
+voice data reloaded every time) with the in-process libespeak-ng binding that
+EnhancedSpeechManager uses when the shared library is installed. Run from the
+repository root:
+
+    python src/modules/bench_tts_engine.py --rounds 50
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from jarvis import EspeakLibrary
+
+# A one-word reply isolates the fixed overhead; a full sentence shows it against real synthesis
+UTTERANCES = (
+    ("short", "Yes, sir."),
+    ("sentence", "Systems initialized successfully. How may I assist you today, sir?"),
+)
+
+
+def command_synth(text: str, rate: int) -> int:
+    result = subprocess.run(['espeak-ng', '-s', str(rate), '--stdout', text], capture_output=True, timeout=30)
+    return len(result.stdout)
+
+
+def timings_ms(fn, text: str, rate: int, rounds: int) -> list:
+    fn(text, rate)  # warm the page cache / first-call setup
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(text, rate)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark espeak-ng synthesis paths")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--rate", type=int, default=180)
+    args = parser.parse_args()
+
+    paths = {}
+    if shutil.which('espeak-ng'):
+        paths['command'] = command_synth
+    start = time.perf_counter()
+    library = EspeakLibrary.load()
+    load_ms = (time.perf_counter() - start) * 1000
+    if library:
+        paths['in-process'] = lambda text, rate: len(library.synthesize(text, rate).frames)
+    if not paths:
+        print("Neither the espeak-ng command nor libespeak-ng is installed.")
+        return
+
+    print(f"\nespeak-ng synthesis, {args.rounds} rounds at rate {args.rate}")
+    if library:
+        print(f"  library load    {load_ms:.1f} ms once at startup ({library.sample_rate} Hz)")
+    print(f"  {'':12}{'path':>12}{'p50 ms':>10}{'mean ms':>10}{'max ms':>10}")
+    medians = {}
+    for label, text in UTTERANCES:
+        for name, fn in paths.items():
+            samples = timings_ms(fn, text, args.rate, args.rounds)
+            medians[label, name] = statistics.median(samples)
+            print(f"  {label:12}{name:>12}{medians[label, name]:>10.1f}"
+                  f"{statistics.mean(samples):>10.1f}{max(samples):>10.1f}")
+    if len(paths) == 2:
+        for label, _ in UTTERANCES:
+            saved = medians[label, 'command'] - medians[label, 'in-process']
+            print(f"  {label:12}{'saving':>12}{saved:>10.1f} ms per utterance "
+                  f"({saved / medians[label, 'command']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
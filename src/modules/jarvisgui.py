@@ -509,6 +509,7 @@ class JarvisBackendIntegrator(QThread):
     response_ready = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
     hotword_detected = pyqtSignal()
+    playback_event = pyqtSignal(dict)
     
     def __init__(self):
         super().__init__()
@@ -531,6 +532,11 @@ class JarvisBackendIntegrator(QThread):
         """Connect to existing JARVIS instance from main logic"""
         self.jarvis_instance = jarvis_instance
         logger.info("✅ JARVIS instance connected to backend")
+        
+        # Playback events arrive on the engine thread; the signal hands them to the GUI thread
+        music = getattr(jarvis_instance, 'music_controller', None)
+        if music and hasattr(music, 'subscribe'):
+            music.subscribe(self.playback_event.emit)
         self.set_state("ONLINE")
     
     def set_state(self, new_state):
@@ -719,11 +725,11 @@ class JarvisBackendIntegrator(QThread):
                     
                     self.set_state("SPEAKING")
                     try:
-                        self.jarvis_instance.speak(response)
-                        # Calculate speaking time
-                        word_count = len(response.split())
-                        speak_time = min(word_count * 0.12, 4)  # Max 4 seconds
-                        time.sleep(speak_time)
+                        # speak() queues and returns a handle; stay SPEAKING until the audio
+                        # has actually finished or was cut off by a newer command
+                        handle = self.jarvis_instance.speak(response)
+                        if hasattr(handle, 'wait'):
+                            handle.wait(timeout=120)
                     except Exception as e:
                         logger.error(f"Speak error: {e}")
                 
@@ -757,6 +763,10 @@ class JarvisBackendIntegrator(QThread):
         logger.info(f"Queueing command: {command}")
         self.command_queue.put(command)
         
+        # Barge-in: a new command cuts off the reply still being spoken
+        if self.current_state == "SPEAKING" and hasattr(self.jarvis_instance, 'interrupt_speech'):
+            self.jarvis_instance.interrupt_speech()
+        
         # Process immediately if in ONLINE state
         if self.current_state == "ONLINE":
             self.process_queued_commands_safe()
@@ -898,6 +908,19 @@ class IronManHUD(QMainWindow):
                 }
             """)
         
+        # Now playing (hidden until the playback engine reports a track)
+        self.now_playing_label = QLabel()
+        self.now_playing_label.setStyleSheet("""
+            QLabel {
+                color: #80D0FF;
+                font-size: 11px;
+                font-family: 'Consolas';
+                background: transparent;
+                margin-left: 10px;
+            }
+        """)
+        self.now_playing_label.hide()
+        
         # Status indicator
         self.status_indicator = QLabel("ONLINE")
         self.status_indicator.setStyleSheet("""
@@ -916,6 +939,7 @@ class IronManHUD(QMainWindow):
         status_layout.addWidget(self.time_label)
         status_layout.addWidget(self.date_label)
         status_layout.addStretch()
+        status_layout.addWidget(self.now_playing_label)
         status_layout.addWidget(self.cpu_label)
         status_layout.addWidget(self.ram_label)
         status_layout.addWidget(self.status_indicator)
@@ -1301,6 +1325,7 @@ class IronManHUD(QMainWindow):
         self.backend.response_ready.connect(self.handle_response)
         self.backend.hotword_detected.connect(self.handle_hotword)
         self.backend.error_occurred.connect(self.handle_error)
+        self.backend.playback_event.connect(self.handle_playback_event)
     
     def handle_state_change(self, state):
         """Handle system state changes"""
@@ -1415,6 +1440,22 @@ class IronManHUD(QMainWindow):
         self.chat_display.insertHtml(html)
         self.scroll_chat()
     
+    def handle_playback_event(self, event):
+        """Show the current track and its progress in the status bar"""
+        if event['state'] not in ("playing", "paused") or not event['media']:
+            self.now_playing_label.hide()
+            return
+        
+        elapsed = event['time_ms'] // 1000
+        progress = f"{elapsed // 60}:{elapsed % 60:02d}"
+        if event['length_ms']:
+            total = event['length_ms'] // 1000
+            progress += f" / {total // 60}:{total % 60:02d}"
+        icon = "▶" if event['state'] == "playing" else "⏸"
+        media = event['media'] if len(event['media']) <= 40 else event['media'][:39] + "…"
+        self.now_playing_label.setText(f"{icon} {media}  {progress}")
+        self.now_playing_label.show()
+    
     def handle_error(self, error):
         """Handle error"""
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -1531,13 +1572,31 @@ class IronManHUD(QMainWindow):
 ║ Disk:   {disk.percent:6.1f}%           ║
 ║ Uptime: {days}d {hours:02d}:{minutes:02d}      ║
 ║ Processes: {len(psutil.pids()):6d}           ║
-╚══════════════════════════╝
+{self.service_status_lines()}╚══════════════════════════╝
             """
             self.system_info.setPlainText(info.strip())
             
         except Exception as e:
             logger.error(f"System monitor error: {e}")
     
+    def service_status_lines(self):
+        """Circuit-breaker state of each external service, one box row per service"""
+        jarvis = self.backend.jarvis_instance
+        breakers = getattr(jarvis, 'breakers', None)
+        if not breakers:
+            return ""
+        
+        rows = "╠══════════════════════════╣\n"
+        for name, state in sorted(breakers.states().items()):
+            if state['state'] == 'closed':
+                label = "ONLINE"
+            elif state['state'] == 'half_open':
+                label = "PROBING"
+            else:
+                label = f"OFFLINE {state['retry_in']:.0f}s"
+            rows += f"║ {name.upper():<9}{label:<16}║\n"
+        return rows
+    
     def scroll_chat(self):
         """Scroll chat to bottom"""
         scrollbar = self.chat_display.verticalScrollBar()
@@ -0,0 +1,190 @@
+"""
+JARVIS MARK I - LOCAL AI STAND-IN SERVER
+Speaks the OpenRouter/OpenAI /api/v1/chat/completions protocol (streaming and
+non-streaming) so AIInterface can be exercised and benchmarked offline.
+
+    python src/modules/mock_ai_server.py --port 8765 --latency 0.3 --token-rate 40
+
+Then point "api_url" in jarvis_config.json at http://127.0.0.1:8765/api/v1/chat/completions
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "Certainly sir. The arc reactor is operating within normal parameters. "
+    "I have analysed the request and prepared a concise answer. "
+    "Shall I proceed with the next task, sir?"
+).split()
+
+
+class MockAIConfig:
+    """Behaviour knobs for the stand-in server"""
+
+    def __init__(self, latency: float = 0.2, token_rate: float = 50.0, tokens: int = 40,
+                 error_rate: float = 0.0, timeout_rate: float = 0.0, hang_seconds: float = 30.0,
+                 seed: int = None):
+        self.latency = latency            # seconds before the first token
+        self.token_rate = token_rate      # tokens per second after the first
+        self.tokens = tokens              # completion length in tokens (words)
+        self.error_rate = error_rate      # fraction of requests answered with HTTP 500/429
+        self.timeout_rate = timeout_rate  # fraction of requests that hang for hang_seconds
+        self.hang_seconds = hang_seconds
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.streamed = 0
+        self.errors = 0
+        self.hangs = 0
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'requests': self.requests, 'streamed': self.streamed,
+                    'errors': self.errors, 'hangs': self.hangs}
+
+
+class MockAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real upstream
+    config: MockAIConfig = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_chunk(self, text: str):
+        data = text.encode('utf-8')
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_HEAD(self):
+        """Reachability check (AIInterface's circuit-breaker probe)"""
+        self.send_response(204)
+        self.end_headers()
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "invalid JSON"}})
+            return
+
+        cfg = self.config
+        with cfg._lock:
+            cfg.requests += 1
+            roll = cfg.random.random()
+            fail = roll < cfg.error_rate
+            hang = not fail and roll < cfg.error_rate + cfg.timeout_rate
+            cfg.errors += fail
+            cfg.hangs += hang
+            cfg.streamed += bool(payload.get("stream"))
+
+        if fail:
+            status = cfg.random.choice((429, 500))
+            self._send_json(status, {"error": {"code": status, "message": "simulated upstream failure"}})
+            return
+        if hang:
+            time.sleep(cfg.hang_seconds)
+
+        max_tokens = int(payload.get("max_tokens") or cfg.tokens)
+        words = [WORDS[i % len(WORDS)] for i in range(min(cfg.tokens, max_tokens))]
+        model = payload.get("model", "mock/model")
+        completion_id = f"gen-{uuid.uuid4().hex[:12]}"
+        per_token = 1.0 / cfg.token_rate if cfg.token_rate > 0 else 0.0
+
+        time.sleep(cfg.latency)
+
+        if payload.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self._write_chunk(": OPENROUTER PROCESSING\n\n")
+            for i, word in enumerate(words):
+                if i:
+                    time.sleep(per_token)
+                chunk = {
+                    "id": completion_id, "object": "chat.completion.chunk", "model": model,
+                    "choices": [{"index": 0, "delta": {"content": (" " if i else "") + word},
+                                 "finish_reason": None}],
+                }
+                self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+            self._write_chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+            return
+
+        time.sleep(per_token * max(0, len(words) - 1))
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in payload.get("messages", []))
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": " ".join(words)}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(words),
+                      "total_tokens": prompt_tokens + len(words)},
+        })
+
+
+def start_server(config: MockAIConfig, host: str = "127.0.0.1", port: int = 0):
+    """Start the server on a daemon thread; returns (server, base_url)"""
+    handler = type("BoundMockAIHandler", (MockAIHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://{host}:{server.server_address[1]}/api/v1/chat/completions"
+    return server, url
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--token-rate", type=float, default=50.0, help="tokens per second")
+    parser.add_argument("--tokens", type=int, default=40, help="completion length in tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of HTTP 429/500 replies")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="fraction of requests that hang")
+    parser.add_argument("--hang-seconds", type=float, default=30.0, help="how long a hung request stalls")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args) -> MockAIConfig:
+    return MockAIConfig(latency=args.latency, token_rate=args.token_rate, tokens=args.tokens,
+                        error_rate=args.error_rate, timeout_rate=args.timeout_rate,
+                        hang_seconds=args.hang_seconds, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stand-in for JARVIS")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server, url = start_server(config_from_args(args), args.host, args.port)
+    print(f"Mock AI server listening on {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()